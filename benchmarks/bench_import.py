@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""Times how long a new interpreter takes to import pywinds and run its first call, as the scripts do.
+
+Usage: python benchmarks/bench_import.py [--repeat 5]
+
+Each case runs in its own interpreter, so nothing is imported already. Heavy dependencies (xarray, pyresample,
+netCDF4) are only imported by the calls that need an area or save data, which the output shows for each case.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+_HEAVY = ('xarray', 'pyresample', 'netCDF4', 'pandas')
+# Name and python of each case, timed from before pywinds is imported until after the call.
+_CASES = {'import': '',
+          'loxodrome_bck': 'wind_functions.loxodrome_bck(20, 20, 40, 40)',
+          'geodesic_bck': 'wind_functions.geodesic_bck(20, 20, 40, 40)',
+          'wind_info_fll': 'wind_functions.wind_info_fll(100, 20, 20, 40, 40)',
+          'area': 'wind_functions.area(60, 90, 0, shape=[5, 5], pixel_size=4000, center=[90, 0])'}
+_TEMPLATE = """
+import json, sys, time
+start = time.perf_counter()
+from pywinds import wind_functions, wrapper_utils
+{0}
+print(json.dumps({{'seconds': time.perf_counter() - start, 'loaded': [name for name in {1} if name in sys.modules]}}))
+"""
+
+
+def _run(call):
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([_ROOT] + os.environ.get('PYTHONPATH', '').split(os.pathsep)))
+    output = subprocess.check_output([sys.executable, '-W', 'ignore', '-c', _TEMPLATE.format(call, _HEAVY)], env=env)
+    return json.loads(output.decode('utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=5, help='Interpreters started for each case')
+    args = parser.parse_args()
+    print('{0:<16} {1:>10}  {2}'.format('case', 'min s', 'heavy modules imported'))
+    for name, call in _CASES.items():
+        runs = [_run(call) for _ in range(args.repeat)]
+        print('{0:<16} {1:>10.3f}  {2}'.format(name, min(run['seconds'] for run in runs),
+                                               ', '.join(runs[0]['loaded']) or '-'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+"""Times how long the scripts take to parse their command lines.
+
+Usage: python benchmarks/bench_parse.py [--repeat 20]
+
+Each command line is parsed the way run_script parses it: the parser is made for the script's flags and argv, then
+parse_args is run. The fastest of --repeat parses is printed in milliseconds.
+"""
+import argparse
+import time
+
+from pywinds.wrapper_utils import _make_parser
+
+_WIND_INFO = ['-p', '-s', '-j', '-i', '--pixel-size', '--center', '--displacement-data', '--from-lat-long',
+              '--projection', '--projection-ellipsoid', '--earth-ellipsoid', '--area-extent', '--shape',
+              '--upper-left-extent', '--radius', '--units', '--dtype', '--block-size', '--max-memory', '--format',
+              '--compression', '--chunks', '--pack', '--no-matrix', '--jobs', '--threads', '--profile-out', 'lat-ts',
+              'lat-0', 'long-0', 'delta-time']
+_LOXODROME = ['--earth-ellipsoid', '--units', '--dtype', '--profile-out', 'old-lat', 'old-long', 'distance',
+              'forward-bearing']
+# Name, flags of the script, and command line.
+_CASES = [('wind_info', _WIND_INFO, '60 90 0 100 --displacement-data in.flo -p'),
+          ('wind_info units', _WIND_INFO,
+           '60 90 0 100 --pixel-size 4 km --center 90 0 --radius 2000 2000 km --projection-ellipsoid a 6371 km '
+           'b 6371 km --earth-ellipsoid WGS84 --shape 1000 1000 -p'),
+          ('wind_info all', _WIND_INFO,
+           '60 90 0 100 --pixel-size 4 4 km --center 90 0 m --upper-left-extent 5 6 km --radius 2000 km '
+           '--area-extent 1 2 3 4 km --projection-ellipsoid a 6371 km rf 298 --earth-ellipsoid a 6371 b 6350 '
+           '--shape 1000 1000 --units m --dtype float32 --block-size 64 --threads 2 -j 1:5 -i 2,3 -p -vv'),
+          ('loxodrome fwd', _LOXODROME, '20 20 1000 km 45 --earth-ellipsoid a 6371 km b 6371 km')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=20, help='Parses of each command line')
+    args = parser.parse_args()
+    print('{0:<18} {1:>6} {2:>10}'.format('case', 'tokens', 'min ms'))
+    for name, flag_names, command in _CASES:
+        argv = command.split(' ')
+        runs = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            _make_parser(list(flag_names), name, argv).parse_args(argv)
+            runs.append(time.perf_counter() - start)
+        print('{0:<18} {1:>6} {2:>10.3f}'.format(name, len(argv), min(runs) * 1000))
+
+
+if __name__ == '__main__':
+    main()
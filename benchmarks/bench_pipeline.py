@@ -0,0 +1,212 @@
+#!/usr/bin/env python
+"""Times each stage of pywinds on synthetic .flo files and writes the results as JSON lines.
+
+Usage: python benchmarks/bench_pipeline.py [--sizes 512 1024 2048] [--stages wind_info ...] [--repeat 3]
+                                           [--threads 1] [--dtype float64] [--data-dir path] [--output results.jsonl]
+       python benchmarks/bench_pipeline.py --compare old.jsonl new.jsonl
+
+Each line holds one stage at one size: the fastest of --repeat runs in seconds, every run, and the peak memory that
+Python and numpy allocated during one more run (measured with tracemalloc, so memory-mapped files and buffers that
+netCDF allocates itself are not counted). Every line also records the label (the git revision by default) and the
+versions that it was measured with, so that files from different releases can be compared with --compare.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pyproj
+import xarray
+
+from pywinds.wind_functions import _compute_lat_long, _find_displacements, _save_data, geodesic_bck, \
+    loxodrome_bck, wind_info
+from synthetic_flo import SyntheticField
+
+# The area that every file is projected with: a polar stereographic grid 8000 km across.
+_AREA = dict(lat_ts=60, lat_0=90, long_0=0)
+_WIDTH = 8e6
+_VARIABLES = ('new_latitude', 'new_longitude', 'speed', 'angle', 'v', 'u')
+
+
+def _lat_long(path, size, options):
+    shape, new_lat, new_long, old_lat, old_long = _compute_lat_long(
+        displacement_data=path, pixel_size=_WIDTH / size, dtype=options['dtype'], workers=options['threads'],
+        **_AREA)
+    return old_lat, old_long, new_lat, new_long
+
+
+def _load_displacements(path):
+    # The displacements are memory-mapped, so they are only read once they are used.
+    shape, j_displacement, i_displacement = _find_displacements(path)
+    return np.asarray(j_displacement).sum() + np.asarray(i_displacement).sum()
+
+
+def _find_displacements_stage(path, size, directory, options):
+    return lambda: _load_displacements(path)
+
+
+def _lat_long_stage(path, size, directory, options):
+    return lambda: _lat_long(path, size, options)
+
+
+def _loxodrome_stage(path, size, directory, options):
+    positions = _lat_long(path, size, options)
+    return lambda: loxodrome_bck(*positions, dtype=options['dtype'], workers=options['threads'])
+
+
+def _geodesic_stage(path, size, directory, options):
+    positions = _lat_long(path, size, options)
+    return lambda: geodesic_bck(*positions, workers=options['threads'])
+
+
+def _wind_info_stage(path, size, directory, options):
+    return lambda: wind_info(displacement_data=path, delta_time=100, pixel_size=_WIDTH / size, no_save=True,
+                             precision=2, dtype=options['dtype'], workers=options['threads'], **_AREA)
+
+
+def _wind_info_save_stage(path, size, directory, options):
+    runs = iter(range(sys.maxsize))
+
+    def run():
+        # Every run saves to its own directory, which is deleted afterwards.
+        timestamp = str(next(runs))
+        wind_info(displacement_data=path, delta_time=100, pixel_size=_WIDTH / size, no_save=False,
+                  save_directory=directory, timestamp=timestamp, precision=2, dtype=options['dtype'],
+                  workers=options['threads'], **_AREA)
+        shutil.rmtree(os.path.join(directory, '{0}_output_{1}'.format(os.path.basename(path), timestamp)))
+    return run
+
+
+def _save_data_stage(path, size, directory, options):
+    winds = wind_info(displacement_data=path, delta_time=100, pixel_size=_WIDTH / size, no_save=True, precision=2,
+                      dtype=options['dtype'], workers=options['threads'], **_AREA)
+    variables = [xarray.DataArray(np.reshape(column, (size, size)), name=name, dims=['y', 'x'])
+                 for name, column in zip(_VARIABLES, np.asarray(winds).T)]
+    save_directory = os.path.join(directory, 'save_data')
+
+    def run():
+        _save_data(save_directory, variables, mode='w', precision=2)
+        shutil.rmtree(save_directory)
+    return run
+
+
+# Stages in the order they run. Each makes the function that is timed, so that its inputs are not.
+_STAGES = {'find_displacements': _find_displacements_stage, 'compute_lat_long': _lat_long_stage,
+           'loxodrome_bck': _loxodrome_stage, 'geodesic_bck': _geodesic_stage, 'wind_info': _wind_info_stage,
+           'wind_info_save': _wind_info_save_stage, 'save_data': _save_data_stage}
+
+
+def _revision():
+    """git revision of the checkout that pywinds is imported from, or None."""
+    from pywinds import wind_functions
+
+    try:
+        return subprocess.check_output(['git', 'describe', '--always', '--dirty'], stderr=subprocess.DEVNULL,
+                                       cwd=os.path.dirname(os.path.abspath(wind_functions.__file__))).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _environment(label):
+    return {'label': label, 'python': platform.python_version(), 'numpy': np.__version__,
+            'pyproj': pyproj.__version__, 'xarray': xarray.__version__, 'machine': platform.machine(),
+            'cpus': os.cpu_count()}
+
+
+def _measure(func, repeat):
+    """Seconds of each of repeat runs, then the peak megabytes traced during one more run."""
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return runs, peak / 2 ** 20
+
+
+def _flo_file(data_dir, size, seed, fill_value):
+    """Path of the synthetic file of size, which is only made if it is not in data_dir already."""
+    path = os.path.join(data_dir, 'synthetic_{0}_seed{1}_fill{2}.flo'.format(size, seed, fill_value))
+    if not os.path.exists(path):
+        SyntheticField((size, size), seed=seed, fill_value=fill_value).write(path)
+    return path
+
+
+def run(args):
+    environment = _environment(args.label or _revision())
+    options = {'dtype': args.dtype, 'threads': args.threads}
+    # Grids are computed every time instead of being read from the grid cache.
+    os.environ.pop('PYWINDS_GRID_CACHE', None)
+    directory = tempfile.mkdtemp()
+    data_dir = args.data_dir or directory
+    output = open(args.output, 'a') if args.output else sys.stdout
+    try:
+        for size in args.sizes:
+            path = _flo_file(data_dir, size, args.seed, args.fill_value)
+            for stage in args.stages:
+                runs, peak = _measure(_STAGES[stage](path, size, directory, options), args.repeat)
+                record = dict(environment, stage=stage, size=size, dtype=args.dtype, threads=args.threads,
+                              seconds=min(runs), runs=runs, peak_mb=peak)
+                output.write(json.dumps(record) + '\n')
+                output.flush()
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        shutil.rmtree(directory)
+
+
+def _read(path):
+    with open(path) as file:
+        return {(record['stage'], record['size'], record['dtype'], record['threads']): record
+                for record in (json.loads(line) for line in file if line.strip())}
+
+
+def compare(old_path, new_path):
+    """Prints the time and peak memory of each stage in new_path relative to old_path."""
+    old, new = _read(old_path), _read(new_path)
+    print('{0:<20} {1:>6} {2:>10} {3:>10} {4:>7} {5:>10} {6:>10} {7:>7}'.format(
+        'stage', 'size', 'old s', 'new s', 'ratio', 'old MB', 'new MB', 'ratio'))
+    for key in sorted(set(old) & set(new), key=lambda key: (list(_STAGES).index(key[0]), key[1:])):
+        before, after = old[key], new[key]
+        print('{0:<20} {1:>6} {2:>10.3f} {3:>10.3f} {4:>7.2f} {5:>10.1f} {6:>10.1f} {7:>7.2f}'.format(
+            key[0], key[1], before['seconds'], after['seconds'], after['seconds'] / before['seconds'],
+            before['peak_mb'], after['peak_mb'], after['peak_mb'] / max(before['peak_mb'], 1e-9)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[512, 1024, 2048],
+                        help='Rows and columns of each synthetic file, from 512 up to 8192')
+    parser.add_argument('--stages', nargs='+', choices=list(_STAGES), default=list(_STAGES), help='Stages to time')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs of each stage')
+    parser.add_argument('--threads', type=int, default=1, help='workers passed to the stages that take it')
+    parser.add_argument('--dtype', choices=['float32', 'float64'], default='float64', help='dtype of the stages')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the synthetic files')
+    # Projections raise on nan displacements, so failed tracking is filled with no motion.
+    parser.add_argument('--fill-value', type=float, default=0.0,
+                        help='Displacement of the regions where tracking failed. Defaults to 0')
+    parser.add_argument('--data-dir', help='Directory to keep the synthetic files in between runs')
+    parser.add_argument('--label', help='Name of this run in the results. Defaults to the git revision')
+    parser.add_argument('--output', help='JSON lines file to append results to. Defaults to printing them')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='Compare two results files and exit')
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+    else:
+        run(args)
+
+
+if __name__ == '__main__':
+    main()
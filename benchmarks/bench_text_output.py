@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""Times pywinds' text writer against np.savetxt on a grid of wind data and checks that their output is identical.
+
+Usage: python benchmarks/bench_text_output.py [--size 4096] [--precision 2] [--variables 6] [--threads 4]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import numpy as np
+import xarray
+
+from pywinds.wind_functions import _SaveSession, _write_text
+
+
+def _grid(size, seed=0):
+    """Wind speeds in m/s with a few of the values that are formatted specially."""
+    data = np.random.RandomState(seed).normal(0, 30, (size, size)).astype(np.float32).astype(np.float64)
+    data[0, :4] = [np.nan, np.inf, -0.0, -0.001]
+    return data
+
+
+def _time(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def _savetxt(path, data, precision):
+    np.savetxt(path, data, fmt='%.{0}f'.format(precision), delimiter=',')
+
+
+def _fast(path, data, precision):
+    with open(path, 'wb', buffering=2 ** 22) as file:
+        _write_text(file, data, precision)
+
+
+def _session(directory, variables, precision, threads):
+    with _SaveSession(directory, threads=threads) as session:
+        session.write(variables, precision=precision)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--size', type=int, default=4096, help='Rows and columns of the grid')
+    parser.add_argument('--precision', type=int, default=2, help='Decimal places written')
+    parser.add_argument('--variables', type=int, default=6, help='Files written by the session benchmark')
+    parser.add_argument('--threads', type=int, default=os.cpu_count(), help='Threads used by the session benchmark')
+    args = parser.parse_args()
+    data = _grid(args.size)
+    directory = tempfile.mkdtemp()
+    try:
+        savetxt_path = os.path.join(directory, 'savetxt.txt')
+        fast_path = os.path.join(directory, 'fast.txt')
+        savetxt_time = _time(_savetxt, savetxt_path, data, args.precision)
+        fast_time = _time(_fast, fast_path, data, args.precision)
+        with open(savetxt_path, 'rb') as savetxt_file, open(fast_path, 'rb') as fast_file:
+            identical = savetxt_file.read() == fast_file.read()
+        print('{0}x{0} grid, precision {1}'.format(args.size, args.precision))
+        print('np.savetxt:  {0:.2f} s'.format(savetxt_time))
+        print('_write_text: {0:.2f} s ({1:.1f}x), identical output: {2}'.format(fast_time, savetxt_time / fast_time,
+                                                                                 identical))
+        variables = [xarray.DataArray(data, name='variable_{0}'.format(number)) for number in range(args.variables)]
+        for threads in sorted({1, args.threads}):
+            session_time = _time(_session, os.path.join(directory, 'threads_{0}'.format(threads)), variables,
+                                 args.precision, threads)
+            print('{0} files on {1} thread(s): {2:.2f} s'.format(args.variables, threads, session_time))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+"""Writes synthetic .flo displacement files with vortices, jets and regions where tracking failed.
+
+Usage: python benchmarks/synthetic_flo.py output.flo [--size 2048] [--width 2048] [--seed 0] [--missing 0.02]
+                                                     [--fill-value nan]
+
+Features have a fixed size in pixels, so larger files hold more of them instead of bigger ones. Files are made
+_BLOCK_ROWS rows at a time: memory use does not grow with the file, and the same arguments always give the same file.
+"""
+import argparse
+import struct
+
+import numpy as np
+
+# Rows generated at a time. Noise is drawn per block, so changing this changes the files.
+_BLOCK_ROWS = 256
+# Vortices are left out beyond this many radii, where they have decayed to nothing.
+_VORTEX_REACH = 4
+# Pixels of image per vortex and per jet.
+_VORTEX_AREA = 512 ** 2
+_JET_ROWS = 1024
+
+
+class SyntheticField:
+    """Displacements (in pixels) of a field of shape (rows, columns): a steady drift, Lamb-Oseen like vortices,
+    meandering jets, a little noise, and elliptical regions set to fill_value that cover about missing of the image.
+    """
+
+    def __init__(self, shape, seed=0, missing=0.02, fill_value=np.nan):
+        self.shape = rows, cols = tuple(int(size) for size in shape)
+        self.seed = seed
+        self.fill_value = fill_value
+        random = np.random.RandomState(seed)
+        self.drift = random.uniform(-2, 2, 2)
+        count = max(1, round(rows * cols / _VORTEX_AREA))
+        # (row, column, radius, peak displacement); the sign of the displacement is the direction of rotation.
+        self.vortices = np.column_stack([random.uniform(0, rows, count), random.uniform(0, cols, count),
+                                         random.uniform(20, 64, count),
+                                         random.choice([-1, 1], count) * random.uniform(3, 8, count)])
+        count = max(1, round(rows / _JET_ROWS))
+        # (row, amplitude, wavelength, phase, half width, peak displacement)
+        self.jets = np.column_stack([random.uniform(0, rows, count), random.uniform(10, 60, count),
+                                     random.uniform(200, 800, count), random.uniform(0, 2 * np.pi, count),
+                                     random.uniform(8, 24, count), random.uniform(10, 20, count)])
+        # Radii average 35 pixels.
+        count = int(round(missing * rows * cols / (np.pi * 35 ** 2)))
+        # (row, column, row radius, column radius)
+        self.holes = np.column_stack([random.uniform(0, rows, count), random.uniform(0, cols, count),
+                                      random.uniform(10, 60, count), random.uniform(10, 60, count)])
+
+    def block(self, start, stop):
+        """(i_displacement, j_displacement) of rows start to stop, as float32."""
+        cols = self.shape[1]
+        random = np.random.RandomState([self.seed, start // _BLOCK_ROWS])
+        i_block = random.normal(self.drift[0], 0.25, (stop - start, cols))
+        j_block = random.normal(self.drift[1], 0.25, (stop - start, cols))
+        for row, col, radius, peak in self.vortices:
+            reach = _VORTEX_REACH * radius
+            top, bottom = max(start, int(row - reach)), min(stop, int(row + reach) + 1)
+            left, right = max(0, int(col - reach)), min(cols, int(col + reach) + 1)
+            if top >= bottom or left >= right:
+                continue
+            dy = np.arange(top, bottom)[:, None] - row
+            dx = np.arange(left, right)[None] - col
+            # Speed over distance: the tangential speed peaks at peak, one radius from the center.
+            scale = peak / radius * np.exp(.5 * (1 - (dx ** 2 + dy ** 2) / radius ** 2))
+            i_block[top - start:bottom - start, left:right] -= scale * dy
+            j_block[top - start:bottom - start, left:right] += scale * dx
+        x = np.arange(cols)
+        for row, amplitude, wavelength, phase, width, peak in self.jets:
+            top, bottom = max(start, int(row - amplitude - 4 * width)), min(stop, int(row + amplitude + 4 * width) + 1)
+            if top >= bottom:
+                continue
+            angle = 2 * np.pi * x / wavelength + phase
+            center = row + amplitude * np.sin(angle)
+            slope = amplitude * 2 * np.pi / wavelength * np.cos(angle)
+            speed = peak * np.exp(-((np.arange(top, bottom)[:, None] - center) / width) ** 2)
+            # Along the jet's center line.
+            i_block[top - start:bottom - start] += speed / np.hypot(1, slope)
+            j_block[top - start:bottom - start] += speed * slope / np.hypot(1, slope)
+        for row, col, row_radius, col_radius in self.holes:
+            top, bottom = max(start, int(row - row_radius)), min(stop, int(row + row_radius) + 1)
+            left, right = max(0, int(col - col_radius)), min(cols, int(col + col_radius) + 1)
+            if top >= bottom or left >= right:
+                continue
+            inside = ((np.arange(top, bottom)[:, None] - row) / row_radius) ** 2 + \
+                ((np.arange(left, right)[None] - col) / col_radius) ** 2 <= 1
+            i_block[top - start:bottom - start, left:right][inside] = self.fill_value
+            j_block[top - start:bottom - start, left:right][inside] = self.fill_value
+        return i_block.astype(np.float32), j_block.astype(np.float32)
+
+    def displacements(self):
+        """[j_displacement, i_displacement] of the whole field, flattened in row-major order like pywinds takes
+        lists. Only for fields that fit in memory."""
+        i_displacement, j_displacement = [np.concatenate(blocks) for blocks in zip(*self._blocks())]
+        return np.array([j_displacement.ravel(), i_displacement.ravel()])
+
+    def _blocks(self):
+        for start in range(0, self.shape[0], _BLOCK_ROWS):
+            yield self.block(start, min(start + _BLOCK_ROWS, self.shape[0]))
+
+    def write(self, path):
+        """Writes the field to a .flo file: the tag, the rows and columns as int32, then interleaved float32 (i, j)
+        displacements, which is what pywinds.wind_functions.FloFile reads."""
+        with open(path, 'wb') as file:
+            file.write(struct.pack('4sii', b'PIEH', *self.shape))
+            for i_block, j_block in self._blocks():
+                np.stack([i_block, j_block], axis=-1).tofile(file)
+        return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('path', help='.flo file to write')
+    parser.add_argument('--size', type=int, default=2048, help='Rows of the field')
+    parser.add_argument('--width', type=int, help='Columns of the field. Defaults to --size')
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the random features')
+    parser.add_argument('--missing', type=float, default=0.02, help='Fraction of the field where tracking failed')
+    parser.add_argument('--fill-value', type=float, default=np.nan,
+                        help='Displacement written where tracking failed. Defaults to nan')
+    args = parser.parse_args()
+    SyntheticField((args.size, args.width or args.size), seed=args.seed, missing=args.missing,
+                   fill_value=args.fill_value).write(args.path)
+
+
+if __name__ == '__main__':
+    main()
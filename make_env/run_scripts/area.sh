@@ -2,7 +2,7 @@
 
 PARENTDIR="$( cd -P "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
 source $PARENTDIR/env/bin/activate  2> /dev/null
-python -W ignore<<EOF
+python -W ignore -m pywinds.worker run --source-fd 3 3<<EOF
 import sys
 
 from os.path import abspath
@@ -17,7 +17,8 @@ def output_format(output, precision, **kwargs):
 if __name__ == "__main__":
     sys.argv = [abspath("$0")] + "$*".split(' ')
     kwargs_names = ['--displacement-data', '--projection', '--area-extent', '--shape',
-                    '--center', '--pixel-size', '--upper-left-extent', '--radius', '--units', '--projection-ellipsoid']
+                    '--center', '--pixel-size', '--upper-left-extent', '--radius', '--units', '--projection-ellipsoid',
+                    '--profile-out']
     args_names = ['lat-ts', 'lat-0', 'long-0']
     run_script(area, kwargs_names + args_names, output_format, 'area')
 EOF
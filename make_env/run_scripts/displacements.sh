@@ -2,7 +2,7 @@
 
 PARENTDIR="$( cd -P "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
 source $PARENTDIR/env/bin/activate  2> /dev/null
-python -W ignore<<EOF
+python -W ignore -m pywinds.worker run --source-fd 3 3<<EOF
 import numpy as np
 import sys
 
@@ -19,7 +19,7 @@ if __name__ == "__main__":
     sys.argv = [abspath("$0")] + "$*".split(' ')
     kwargs_names = ['--lat-ts', '--lat-0', '--long-0', '--displacement-data', '-j', '-i', '--projection',
                     '--area-extent', '--shape', '--center', '--pixel-size', '--upper-left-extent',
-                    '--radius', '--units', '--projection-ellipsoid']
+                    '--radius', '--units', '--projection-ellipsoid', '--dtype', '--jobs', '--profile-out']
     args_names = []
     run_script(displacements, kwargs_names + args_names, output_format, 'displacements')
 EOF
\ No newline at end of file
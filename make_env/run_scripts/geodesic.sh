@@ -8,7 +8,7 @@ if [[ $* =~ (^|[[:space:]])"--inverse"($|[[:space:]]) ]]; then
 else
     func=geodesic_bck
 fi
-python -W ignore<<EOF
+python -W ignore -m pywinds.worker run --source-fd 3 3<<EOF
 import numpy as np
 import sys
 
@@ -23,11 +23,13 @@ def output_format(output, precision, **kwargs):
 
 if __name__ == "__main__":
     sys.argv = [abspath("$0")] + "$*".split(' ')
-    kwargs_names = ['--earth-ellipsoid', '--units']
+    kwargs_names = ['--earth-ellipsoid', '--units', '--profile-out', '--input', '--input-format',
+                    '--output']
     if "$func" == "geodesic_fwd":
         sys.argv.remove('--inverse')
-        args_names = ['old-lat', 'old-long', 'distance', 'forward-bearing']
+        args_names = ['old-lat', 'old-long', 'distance', 'initial-bearing']
     else:
+        kwargs_names.append('--threads')
         args_names = ['old-lat', 'old-long', 'new-lat', 'new-long']
-    run_script($func, kwargs_names + args_names, output_format, "$func")
+    run_script($func, kwargs_names + args_names, output_format, "$func", point_names=args_names)
 EOF
\ No newline at end of file
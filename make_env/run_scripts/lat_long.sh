@@ -2,7 +2,7 @@
 
 PARENTDIR="$( cd -P "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
 source $PARENTDIR/env/bin/activate  2> /dev/null
-python -W ignore<<EOF
+python -W ignore -m pywinds.worker run --source-fd 3 3<<EOF
 import numpy as np
 import sys
 
@@ -18,7 +18,8 @@ def output_format(output, precision, **kwargs):
 if __name__ == "__main__":
     sys.argv = [abspath("$0")] + "$*".split(' ')
     kwargs_names = ['--pixel-size', '--displacement-data', '-j', '-i', '--projection', '--area-extent', '--shape',
-                    '--center', '--upper-left-extent', '--radius', '--units', '--projection-ellipsoid']
+                    '--center', '--upper-left-extent', '--radius', '--units', '--projection-ellipsoid', '--dtype',
+                    '--threads', '--profile-out']
     args_names = ['lat-ts', 'lat-0', 'long-0']
     run_script(lat_long, kwargs_names + args_names, output_format, 'lat_long')
 EOF
\ No newline at end of file
@@ -2,7 +2,7 @@
 
 PARENTDIR="$( cd -P "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
 source $PARENTDIR/env/bin/activate  2> /dev/null
-python -W ignore<<EOF
+python -W ignore -m pywinds.worker run --source-fd 3 3<<EOF
 import numpy as np
 import sys
 
@@ -18,7 +18,9 @@ def output_format(output, precision, **kwargs):
 if __name__ == "__main__":
     sys.argv = [abspath("$0")] + "$*".split(' ')
     kwargs_names = ['--projection', '--area-extent', '--shape', '--center', '--pixel-size', '--upper-left-extent',
-                    '--radius', '--projection-ellipsoid', '--units', '--displacement-data']
+                    '--radius', '--projection-ellipsoid', '--units', '--displacement-data', '--profile-out', '--input',
+                    '--input-format', '--output']
     args_names = ['lat-ts', 'lat-0', 'long-0', 'lat', 'long']
-    run_script(position_to_pixel, kwargs_names + args_names, output_format, 'position_to_pixel')
+    run_script(position_to_pixel, kwargs_names + args_names, output_format, 'position_to_pixel',
+               point_names=['lat', 'long'])
 EOF
\ No newline at end of file
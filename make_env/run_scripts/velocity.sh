@@ -8,7 +8,7 @@ if [[ $* =~ (^|[[:space:]])"--from-lat-long"($|[[:space:]]) ]]; then
 else
     func=velocity
 fi
-python -W ignore<<EOF
+python -W ignore -m pywinds.worker run --source-fd 3 3<<EOF
 import numpy as np
 import sys
 
@@ -25,12 +25,13 @@ if __name__ == "__main__":
     sys.argv = [abspath("$0")] + "$*".split(' ')
     if "$func" == "velocity_fll":
         sys.argv.remove('--from-lat-long')
-        kwargs_names = ['--earth-ellipsoid']
+        kwargs_names = ['--earth-ellipsoid', '--dtype', '--threads', '--profile-out']
         args_names = ['delta-time', 'old-lat', 'old-long', 'new-lat', 'new-long']
     else:
         kwargs_names = ['--pixel-size', '--displacement-data', '--projection', '-j', '-i', '--area-extent', '--shape',
                         '--center', '--upper-left-extent', '--radius', '--units', '--projection-ellipsoid',
-                        '--earth-ellipsoid', '--from-lat-long']
+                        '--earth-ellipsoid', '--from-lat-long', '--dtype', '--jobs', '--threads',
+                        '--profile-out']
         args_names = ['lat-ts', 'lat-0', 'long-0', 'delta-time']
     run_script($func, kwargs_names + args_names, output_format, "$func")
 EOF
\ No newline at end of file
@@ -8,7 +8,7 @@ if [[ $* =~ (^|[[:space:]])"--from-lat-long"($|[[:space:]]) ]]; then
 else
     func=wind_info
 fi
-python -W ignore<<EOF
+python -W ignore -m pywinds.worker run --source-fd 3 3<<EOF
 import logging
 import ntpath
 import os
@@ -49,13 +49,15 @@ if __name__ == "__main__":
     sys.argv = [os.path.abspath("$0")] + "$*".split(' ')
     if "$func" == "wind_info_fll":
         sys.argv.remove('--from-lat-long')
-        kwargs_names = ['--earth-ellipsoid']
+        kwargs_names = ['--earth-ellipsoid', '--dtype', '--threads', '--profile-out']
         args_names = ['delta-time', 'old-lat', 'old-long', 'new-lat', 'new-long']
         run_script(wind_info_fll, kwargs_names + args_names, output_format_fll, 'wind_info_fll')
     else:
         kwargs_names = ['-p', '-s', '-j', '-i', '--pixel-size', '--center', '--displacement-data', '--from-lat-long',
                         '--projection', '--projection-ellipsoid', '--earth-ellipsoid', '--area-extent', '--shape',
-                        '--upper-left-extent', '--radius', '--units']
+                        '--upper-left-extent', '--radius', '--units', '--dtype', '--block-size', '--max-memory',
+                        '--format', '--compression', '--chunks', '--pack', '--no-matrix', '--jobs',
+                        '--threads', '--profile-out']
         args_names = ['lat-ts', 'lat-0', 'long-0', 'delta-time']
         run_script(wind_info, kwargs_names + args_names, output_format, 'wind_info')
 EOF
\ No newline at end of file
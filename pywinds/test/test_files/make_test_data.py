@@ -1,3 +1,5 @@
+import os
+
 import numpy as np
 
 
@@ -12,7 +14,8 @@ if test_data is None:
         test_data.append(100 * x)
 # Can be any list of 3 integers: Does not affect data
 header = [0, 0, 0]
-filename = '/Users/wroberts/Documents/pywinds/pywinds/test/test_files/' + str(filename) + '.flo'
+# Written next to this script. benchmarks/synthetic_flo.py makes large, realistic files.
+filename = os.path.join(os.path.dirname(os.path.abspath(__file__)), str(filename) + '.flo')
 test_data = test_data
 np.ndarray.tofile(np.array(header + test_data, dtype=np.float32), filename)
 # file = open(filename, 'r+b')
@@ -1,13 +1,35 @@
 #!/usr/bin/env python
 import glob
+import io
+import json
 import os
 import shutil
+import subprocess
+import sys
+import tempfile
 import unittest
+from unittest import mock
 
 import numpy as np
+import xarray
+from pyproj import Geod, Proj
 
-from pywinds.wind_functions import _create_area, _extrapolate_j_i, _pixel_to_pos, area, displacements, lat_long, \
-    velocity, vu, wind_info, loxodrome_bck, loxodrome_fwd
+from pywinds import wind_functions
+from pywinds.wind_functions import (FloFile, _PolarStereographic, _create_area, _extrapolate_j_i, _meridian_arc,
+                                    _meridian_latitude, _pixel_to_pos, _rhumb_lines, _write_grid, _write_text,
+                                    area, area_cache_clear, area_cache_info, displacements, lat_long, velocity,
+                                    vu, wind_dataset, wind_info, loxodrome_bck, loxodrome_fwd, geodesic_bck,
+                                    position_to_pixel)
+
+try:
+    import dask
+except ImportError:
+    dask = None
+
+try:
+    import zarr
+except ImportError:
+    zarr = None
 
 
 class TestCase:
@@ -120,6 +142,23 @@ class TestPywinds(unittest.TestCase):
             self.assertEqual(speed[case.j, case.i], speed_ji)
             self.assertEqual(angle[case.j, case.i], angle_ji)
 
+    def test_wind_columns(self):
+        for case in self.test_cases:
+            kwargs = dict(displacement_data=case.displacement_data, projection=case.projection, units=case.units,
+                          shape=case.shape, pixel_size=case.pixel_size, center=case.center,
+                          projection_ellipsoid=case.projection_ellipsoid, earth_ellipsoid=case.earth_ellipsoid)
+            with mock.patch('numpy.insert', side_effect=AssertionError('wind_info should not copy its columns')):
+                winds = wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, no_save=True, **kwargs)
+                winds_ji = wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, no_save=True, j=case.j,
+                                     i=case.i, **kwargs)
+            # Each column is a row of one (6, N) block.
+            self.assertEqual((np.prod(case.shape), 6), winds.shape)
+            self.assertTrue(winds.T.flags['C_CONTIGUOUS'])
+            speed, angle = velocity(case.lat_ts, case.lat_0, case.long_0, case.delta_time, **kwargs)
+            v, u = vu(case.lat_ts, case.lat_0, case.long_0, case.delta_time, **kwargs)
+            np.testing.assert_array_equal(np.ravel([speed, angle, v, u]), np.ravel(winds.T[2:]))
+            np.testing.assert_array_equal(winds[case.j * case.shape[1] + case.i], winds_ji)
+
     def test_vu(self):
         for case in self.test_cases:
             v_ji, u_ji = vu(case.lat_ts, case.lat_0, case.long_0, case.delta_time,
@@ -180,10 +219,470 @@ class TestPywinds(unittest.TestCase):
             self.assertEqual(case.old_y, round(old_y_ji, 5))
             self.assertEqual(case.new_x, round(new_x_ji, 5))
             self.assertEqual(case.new_y, round(new_y_ji, 5))
-            self.assertEqual(old_x[case.j * case.shape[0] + case.i], old_x_ji)
-            self.assertEqual(old_y[case.j * case.shape[0] + case.i], old_y_ji)
-            self.assertEqual(new_x[case.j * case.shape[0] + case.i], new_x_ji)
-            self.assertEqual(new_y[case.j * case.shape[0] + case.i], new_y_ji)
+            self.assertEqual(old_x[case.j, case.i], old_x_ji)
+            self.assertEqual(old_y[case.j, case.i], old_y_ji)
+            self.assertEqual(new_x[case.j, case.i], new_x_ji)
+            self.assertEqual(new_y[case.j, case.i], new_y_ji)
+
+    def test_extrapolate_j_i(self):
+        j, i = _extrapolate_j_i(None, None, (3, 5))
+        self.assertEqual(((3, 1), (1, 5)), (j.shape, i.shape))
+        j, i = _extrapolate_j_i([0, 2], slice(1, 4), (3, 5))
+        np.testing.assert_array_equal([[0], [2]], j)
+        np.testing.assert_array_equal([[1, 2, 3]], i)
+        # Images that are not square are in row-major order.
+        displacement_data = np.arange(30).reshape(2, 15).tolist()
+        kwargs = dict(displacement_data=displacement_data, shape=(3, 5), pixel_size=4000)
+        old_lat, old_long = lat_long(60, 90, 0, **kwargs)
+        new_lat, new_long = lat_long(60, 90, 0, shape=(3, 5), pixel_size=4000)
+        for j, i in [(0, 4), (2, 1), (1, 3)]:
+            np.testing.assert_array_equal([old_lat[j, i], old_long[j, i]], lat_long(60, 90, 0, j=j, i=i, **kwargs))
+            np.testing.assert_array_equal([new_lat[j, i], new_long[j, i]],
+                                          lat_long(60, 90, 0, shape=(3, 5), pixel_size=4000, j=j, i=i))
+
+    def test_flo_file(self):
+        file_name = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test_files', 'test_data_two.flo')
+        data = np.fromfile(file_name, dtype=np.float32)
+        flo_file = FloFile(file_name)
+        self.assertEqual('\n\x00\x00\x00', flo_file.tag)
+        self.assertEqual((10, 10), flo_file.file_shape)
+        self.assertEqual(100, len(flo_file))
+        self.assertIsInstance(flo_file.j_displacement, np.memmap)
+        self.assertIsInstance(flo_file.i_displacement, np.memmap)
+        np.testing.assert_array_equal(data[3:][1::2], flo_file.j_displacement)
+        np.testing.assert_array_equal(data[3:][0::2], flo_file.i_displacement)
+        j_displacements, i_displacements = displacements(displacement_data=file_name)
+        self.assertEqual(np.float64, j_displacements.dtype)
+        np.testing.assert_array_equal(data[3:][1::2].reshape(10, 10), j_displacements)
+        np.testing.assert_array_equal(data[3:][0::2].reshape(10, 10), i_displacements)
+
+    def test_window(self):
+        for case in self.test_cases:
+            kwargs = dict(displacement_data=case.displacement_data, projection=case.projection, units=case.units,
+                          shape=case.shape, pixel_size=case.pixel_size, center=case.center,
+                          projection_ellipsoid=case.projection_ellipsoid, earth_ellipsoid=case.earth_ellipsoid)
+            rows, cols = [1, 4, 8], slice(2, 6)
+            winds = wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, no_save=True, **kwargs)
+            winds = winds.reshape(list(case.shape) + [6])[rows][:, cols]
+            winds_window = wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, j=rows, i=cols,
+                                     no_save=True, **kwargs)
+            np.testing.assert_array_equal(winds.reshape(-1, 6), winds_window)
+            kwargs.pop('earth_ellipsoid')
+            old_lat, old_long = lat_long(case.lat_ts, case.lat_0, case.long_0, **kwargs)
+            old_lat_window, old_long_window = lat_long(case.lat_ts, case.lat_0, case.long_0, j=slice(3, 5), **kwargs)
+            np.testing.assert_array_equal(old_lat[3:5], old_lat_window)
+            np.testing.assert_array_equal(old_long[3:5], old_long_window)
+            displacement = displacements(displacement_data=case.displacement_data, shape=case.shape)
+            displacement_window = displacements(displacement_data=case.displacement_data, shape=case.shape, j=case.j,
+                                                i=[case.i, 0])
+            np.testing.assert_array_equal(displacement[:, [case.j]][:, :, [case.i, 0]], displacement_window)
+            with self.assertRaises(IndexError):
+                displacements(displacement_data=case.displacement_data, shape=case.shape, j=[0, case.shape[0]])
+
+    def test_dtype(self):
+        for case in self.test_cases:
+            kwargs = dict(displacement_data=case.displacement_data, projection=case.projection, units=case.units,
+                          shape=case.shape, pixel_size=case.pixel_size, center=case.center,
+                          projection_ellipsoid=case.projection_ellipsoid, earth_ellipsoid=case.earth_ellipsoid,
+                          no_save=True)
+            winds_64 = wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, **kwargs)
+            winds_32 = wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, dtype='float32', **kwargs)
+            self.assertEqual(np.float64, winds_64.dtype)
+            self.assertEqual(np.float32, winds_32.dtype)
+            # new_lat, new_long: float32 rounding.
+            np.testing.assert_allclose(winds_64[:, :2], winds_32[:, :2], rtol=0, atol=1e-4)
+            # speed, v, u: 1 mm/s plus float32 rounding. angle: 1e-3 degrees.
+            np.testing.assert_allclose(winds_64[:, [2, 4, 5]], winds_32[:, [2, 4, 5]], rtol=1e-5, atol=1e-3)
+            angle_error = abs(winds_64[:, 3] - winds_32[:, 3])
+            self.assertLess(np.max(np.minimum(angle_error, 360 - angle_error)), 1e-3)
+        # East-west rhumb lines are the worst case for float32; the bearing error here comes from rounding the inputs.
+        distance_64, bearing_64 = loxodrome_bck(70, 0, 70.00001, 1)[:2]
+        distance_32, bearing_32 = loxodrome_bck(70, 0, 70.00001, 1, dtype=np.float32)[:2]
+        self.assertAlmostEqual(1, distance_32 / distance_64, 6)
+        self.assertAlmostEqual(bearing_64, bearing_32, 3)
+        with self.assertRaises(ValueError):
+            loxodrome_bck(70, 0, 71, 1, dtype=np.int32)
+
+    def test_block_size(self):
+        save_directory = os.path.dirname(os.path.abspath(__file__))
+        for case in self.test_cases:
+            kwargs = dict(displacement_data=case.displacement_data, projection=case.projection, units=case.units,
+                          shape=case.shape, pixel_size=case.pixel_size, center=case.center,
+                          projection_ellipsoid=case.projection_ellipsoid, earth_ellipsoid=case.earth_ellipsoid,
+                          save_directory=save_directory, precision=2)
+            winds = wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, timestamp='whole', **kwargs)
+            self.assertIsNone(wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, timestamp='blocks',
+                                        block_size=3, **kwargs))
+            output = glob.glob(os.path.join(save_directory, '*_output_whole'))[0]
+            output_blocks = glob.glob(os.path.join(save_directory, '*_output_blocks'))[0]
+            with xarray.open_dataset(os.path.join(output, 'wind_info.nc')) as dataset, \
+                    xarray.open_dataset(os.path.join(output_blocks, 'wind_info.nc')) as dataset_blocks:
+                self.assertEqual(list(dataset.variables), list(dataset_blocks.variables))
+                for name in dataset.variables:
+                    np.testing.assert_array_equal(dataset[name], dataset_blocks[name])
+                np.testing.assert_allclose(winds, dataset_blocks['wind_info'], rtol=1e-6)
+            for name in ['speed', 'angle', 'wind_info']:
+                np.testing.assert_array_equal(np.loadtxt(os.path.join(output, name + '.txt'), delimiter=','),
+                                              np.loadtxt(os.path.join(output_blocks, name + '.txt'), delimiter=','))
+            for directory in (output, output_blocks):
+                shutil.rmtree(directory)
+        with self.assertRaises(ValueError):
+            wind_info(60, 90, 0, 100, displacement_data=self.test_cases[0].displacement_data, pixel_size=4000,
+                      no_save=True, block_size=3)
+
+    def test_save_format(self):
+        save_directory = os.path.dirname(os.path.abspath(__file__))
+        case = self.test_cases[0]
+        kwargs = dict(displacement_data=case.displacement_data, projection=case.projection, units=case.units,
+                      shape=case.shape, pixel_size=case.pixel_size, center=case.center, save_directory=save_directory,
+                      precision=2)
+        for block_size in (None, 3):
+            wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, timestamp='netcdf', **kwargs)
+            output = glob.glob(os.path.join(save_directory, '*_output_netcdf'))[0]
+            for save_format in ('raw', 'npy', 'zarr'):
+                wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, timestamp=save_format,
+                          save_format=save_format, block_size=block_size, **kwargs)
+                output_format = glob.glob(os.path.join(save_directory, '*_output_' + save_format))[0]
+                self.assertFalse(os.path.exists(os.path.join(output_format, 'wind_info.nc')))
+                with xarray.open_dataset(os.path.join(output, 'wind_info.nc')) as dataset:
+                    if save_format == 'zarr':
+                        if zarr is None:
+                            shutil.rmtree(output_format)
+                            continue
+                        variables = xarray.open_zarr(os.path.join(output_format, 'wind_info.zarr'))
+                    else:
+                        with open(os.path.join(output_format, 'wind_info.json')) as file:
+                            info = json.load(file)
+                        self.assertEqual(list(dataset.variables), list(info['variables']))
+                        variables = {}
+                        for name, variable in info['variables'].items():
+                            path = os.path.join(output_format, variable['file'])
+                            if save_format == 'npy':
+                                data = np.load(path, mmap_mode='r')
+                            else:
+                                data = np.memmap(path, dtype=variable['dtype'], mode='r',
+                                                 shape=tuple(variable['shape']))
+                            variables[name] = xarray.DataArray(data, dims=variable['dims'], attrs=variable['attrs'])
+                    for name in dataset.variables:
+                        np.testing.assert_array_equal(dataset[name], variables[name])
+                        self.assertEqual(dataset[name].dims, variables[name].dims)
+                        self.assertEqual(sorted(dataset[name].attrs), sorted(variables[name].attrs))
+                shutil.rmtree(output_format)
+            shutil.rmtree(output)
+        with self.assertRaises(ValueError):
+            wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, timestamp='hdf', save_format='hdf',
+                      **kwargs)
+        for directory in glob.glob(os.path.join(save_directory, '*_output_hdf')):
+            shutil.rmtree(directory)
+
+    def test_netcdf_encoding(self):
+        save_directory = os.path.dirname(os.path.abspath(__file__))
+        case = self.test_cases[0]
+        kwargs = dict(displacement_data=case.displacement_data, projection=case.projection, units=case.units,
+                      shape=case.shape, pixel_size=case.pixel_size, center=case.center, save_directory=save_directory,
+                      precision=2)
+        packing = {'angle': (0.01, 180), 'v': (0.1, 0)}
+        wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, timestamp='float', **kwargs)
+        for block_size in (None, 3):
+            wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, timestamp='packed', compression=4,
+                      chunks=(2, 3), packing=packing, save_matrix=False, block_size=block_size, **kwargs)
+            output = glob.glob(os.path.join(save_directory, '*_output_float'))[0]
+            output_packed = glob.glob(os.path.join(save_directory, '*_output_packed'))[0]
+            self.assertTrue(os.path.exists(os.path.join(output_packed, 'wind_info.txt')))
+            with xarray.open_dataset(os.path.join(output, 'wind_info.nc')) as dataset, \
+                    xarray.open_dataset(os.path.join(output_packed, 'wind_info.nc')) as dataset_packed:
+                self.assertEqual(list(dataset.variables)[:-1], list(dataset_packed.variables))
+                for name in dataset_packed.variables:
+                    encoding = dataset_packed[name].encoding
+                    if name in packing:
+                        self.assertEqual(np.int16, encoding['dtype'])
+                        np.testing.assert_allclose(dataset[name], dataset_packed[name], atol=packing[name][0])
+                    else:
+                        np.testing.assert_array_equal(dataset[name], dataset_packed[name])
+                    if name != 'polar_stereographic':
+                        self.assertTrue(encoding['zlib'])
+                        self.assertEqual((2, 3), encoding['chunksizes'])
+            shutil.rmtree(output_packed)
+        shutil.rmtree(output)
+        with self.assertRaises(ValueError):
+            wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, timestamp='overflow', no_save=False,
+                      packing={'angle': (0.001, 0)}, **kwargs)
+        for directory in glob.glob(os.path.join(save_directory, '*_output_overflow')):
+            shutil.rmtree(directory)
+        # Level 0 is no compression, as zlib takes it; levels outside 0 to 9 are refused.
+        self.assertNotIn('zlib', wind_functions._netcdf_encoding('speed', (4, 4), ('y', 'x'), compression=0))
+        with self.assertRaises(ValueError):
+            wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, no_save=True, compression=10, **kwargs)
+
+    @unittest.skipIf(dask is None, 'wind_dataset requires dask')
+    def test_wind_dataset(self):
+        for case in self.test_cases:
+            kwargs = dict(displacement_data=case.displacement_data, projection=case.projection, units=case.units,
+                          shape=case.shape, pixel_size=case.pixel_size, center=case.center,
+                          projection_ellipsoid=case.projection_ellipsoid, earth_ellipsoid=case.earth_ellipsoid)
+            winds = wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, no_save=True, **kwargs)
+            winds = winds.reshape(list(case.shape) + [6])
+            with mock.patch('pywinds.wind_functions._compute_vu', wraps=wind_functions._compute_vu) as compute_vu:
+                dataset = wind_dataset(case.lat_ts, case.lat_0, case.long_0, case.delta_time, chunks=(3, 4),
+                                       **kwargs)
+                self.assertEqual(0, compute_vu.call_count)
+                # Rows 4-5 and columns 1-2 are all in one chunk.
+                speed = dataset['speed'].isel(y=slice(4, 6), x=slice(1, 3)).values
+                self.assertEqual(1, compute_vu.call_count)
+            np.testing.assert_array_equal(winds[4:6, 1:3, 2], speed)
+            for index, name in enumerate(['new_latitude', 'new_longitude', 'speed', 'angle', 'v', 'u']):
+                np.testing.assert_array_equal(winds[..., index], dataset[name])
+            dataset = wind_dataset(case.lat_ts, case.lat_0, case.long_0, case.delta_time, j=case.j, i=case.i,
+                                   **kwargs)
+            self.assertEqual(case.speed, round(float(dataset['speed'].squeeze()), 5))
+
+    def test_area_cache(self):
+        case = self.test_cases[0]
+        area_cache_clear()
+        area_data = area(case.lat_ts, case.lat_0, case.long_0, displacement_data=case.displacement_data,
+                         pixel_size=case.pixel_size, center=case.center)
+        misses = area_cache_info()['area'].misses
+        self.assertEqual(0, area_cache_info()['area'].hits)
+        area_data['shape'].append(1)
+        self.assertEqual(area_data['shape'][:2], area(case.lat_ts, case.lat_0, case.long_0,
+                                                      displacement_data=case.displacement_data,
+                                                      pixel_size=case.pixel_size, center=case.center)['shape'])
+        self.assertEqual(misses, area_cache_info()['area'].misses)
+        self.assertLess(0, area_cache_info()['area'].hits)
+        lat_long(case.lat_ts, case.lat_0, case.long_0, displacement_data=case.displacement_data,
+                 pixel_size=case.pixel_size, center=case.center)
+        self.assertLess(0, area_cache_info()['projection'].hits)
+        self.assertLess(0, area_cache_info()['ellipsoid'].hits)
+        self.assertEqual(0, area_cache_info()['coordinates'].hits)
+        old_lat = lat_long(case.lat_ts, case.lat_0, case.long_0, displacement_data=case.displacement_data,
+                           pixel_size=case.pixel_size, center=case.center)[0]
+        old_lat_window = lat_long(case.lat_ts, case.lat_0, case.long_0, displacement_data=case.displacement_data,
+                                  pixel_size=case.pixel_size, center=case.center, j=slice(1, 3), i=[0, 2])[0]
+        np.testing.assert_array_equal(old_lat[1:3][:, [0, 2]], old_lat_window)
+        self.assertEqual(2, area_cache_info()['coordinates'].hits)
+        area_cache_clear()
+        self.assertEqual((0, 0, 0), area_cache_info()['area'][:2] + area_cache_info()['area'][3:])
+
+    def test_profile(self):
+        case = self.test_cases[0]
+        save_directory = tempfile.mkdtemp()
+        try:
+            with wind_functions.profile() as stats:
+                wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time,
+                          displacement_data=case.displacement_data, pixel_size=case.pixel_size, center=case.center,
+                          save_directory=save_directory, precision=2)
+                with self.assertRaises(RuntimeError):
+                    with wind_functions.profile():
+                        pass
+        finally:
+            shutil.rmtree(save_directory)
+        for name in ('area', 'displacements', 'projection', 'loxodrome', 'save_data', 'text', 'save_output'):
+            self.assertLess(0, stats['stages'][name]['calls'])
+            self.assertLessEqual(0, stats['stages'][name]['seconds'])
+        self.assertLessEqual(stats['stages']['projection']['seconds'], stats['seconds'])
+        self.assertLess(0, stats['max_rss_mb'])
+        # Opening the file, then reading the memory-mapped displacements.
+        self.assertEqual(2, stats['stages']['displacements']['calls'])
+        # Nothing is collected once the profile is closed.
+        lat_long(case.lat_ts, case.lat_0, case.long_0, displacement_data=case.displacement_data,
+                 pixel_size=case.pixel_size, center=case.center)
+        self.assertEqual(2, stats['stages']['displacements']['calls'])
+
+    def test_grid_cache(self):
+        cache_directory = tempfile.mkdtemp()
+        try:
+            for case in self.test_cases:
+                kwargs = dict(displacement_data=case.displacement_data, projection=case.projection,
+                              units=case.units, shape=case.shape, pixel_size=case.pixel_size, center=case.center,
+                              projection_ellipsoid=case.projection_ellipsoid, earth_ellipsoid=case.earth_ellipsoid,
+                              no_save=True)
+                winds = wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, **kwargs)
+                with mock.patch.dict(os.environ, {'PYWINDS_GRID_CACHE': cache_directory}), \
+                        mock.patch('pywinds.wind_functions._pixel_to_pos', wraps=_pixel_to_pos) as pixel_to_pos:
+                    np.testing.assert_array_equal(winds, wind_info(case.lat_ts, case.lat_0, case.long_0,
+                                                                   case.delta_time, **kwargs))
+                    self.assertEqual(2, pixel_to_pos.call_count)
+                    # Only the displaced positions are projected once the grid is cached.
+                    np.testing.assert_array_equal(winds, wind_info(case.lat_ts, case.lat_0, case.long_0,
+                                                                   case.delta_time, **kwargs))
+                    self.assertEqual(3, pixel_to_pos.call_count)
+                    winds_window = wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, j=[2, 5],
+                                             i=slice(1, 4), **kwargs)
+                    self.assertEqual(4, pixel_to_pos.call_count)
+                np.testing.assert_array_equal(winds.reshape(list(case.shape) + [6])[[2, 5], 1:4].reshape(-1, 6),
+                                              winds_window)
+            self.assertEqual(2, len(os.listdir(cache_directory)))
+            # A grid larger than the whole cache is kept, and older grids are deleted to make room for it.
+            with mock.patch.dict(os.environ, {'PYWINDS_GRID_CACHE_SIZE': '0'}):
+                _write_grid(os.path.join(cache_directory, 'new.npy'), np.zeros(4), np.zeros(4))
+            self.assertEqual(['new.npy'], os.listdir(cache_directory))
+            # Grids are still read when they cannot be marked as recently used.
+            with mock.patch('os.utime', side_effect=PermissionError):
+                self.assertEqual((2, 4), wind_functions._read_grid(os.path.join(cache_directory, 'new.npy'), 4).shape)
+        finally:
+            shutil.rmtree(cache_directory)
+
+    def test_save_session(self):
+        save_directory = os.path.dirname(os.path.abspath(__file__))
+        for case in self.test_cases:
+            with mock.patch('xarray.Dataset.to_netcdf', autospec=True,
+                            side_effect=xarray.Dataset.to_netcdf) as to_netcdf:
+                winds = wind_info(case.lat_ts, case.lat_0, case.long_0, case.delta_time, units=case.units,
+                                  displacement_data=case.displacement_data, projection=case.projection,
+                                  shape=case.shape, pixel_size=case.pixel_size, center=case.center,
+                                  save_directory=save_directory, precision=2, timestamp='session')
+            self.assertEqual(1, to_netcdf.call_count)
+            output = glob.glob(os.path.join(save_directory, '*_output_session'))[0]
+            with xarray.open_dataset(os.path.join(output, 'wind_info.nc')) as dataset:
+                self.assertEqual(['polar_stereographic', 'j_displacement', 'i_displacement', 'new_latitude',
+                                  'new_longitude', 'old_latitude', 'old_longitude', 'speed', 'angle', 'v', 'u',
+                                  'wind_info'], list(dataset.variables))
+                np.testing.assert_allclose(winds, dataset['wind_info'], rtol=1e-6)
+            shutil.rmtree(output)
+
+    def test_write_text(self):
+        data = np.random.RandomState(0).normal(0, 100, (50, 6))
+        data[0] = [np.nan, np.inf, -np.inf, -0.0, -0.001, 1e300]
+        # Halfway between two outputs, and just below halfway.
+        data[1] = [0.125, 2.5, -0.375, 0.005, 1.0049999, 123456789.015]
+        for precision in range(6):
+            for rows in (data, data.astype(np.float32), data[:, 0], np.zeros((0, 6))):
+                expected = io.BytesIO()
+                np.savetxt(expected, rows, fmt='%.{0}f'.format(precision), delimiter=',')
+                output = io.BytesIO()
+                _write_text(output, rows, precision)
+                self.assertEqual(expected.getvalue(), output.getvalue())
+
+    def test_polar_stereographic(self):
+        x, y = np.meshgrid(np.linspace(-1.2e7, 1.2e7, 101), np.linspace(-1.2e7, 1.2e7, 101))
+        for proj_dict in ({'lat_ts': 60.0, 'lat_0': 90.0, 'lon_0': 0.0, 'proj': 'stere', 'a': 6378137.0,
+                           'f': 0.0033528106647474805},
+                          {'lat_ts': -60.0, 'lat_0': -90.0, 'lon_0': 20.0, 'proj': 'stere', 'a': 6378137.0,
+                           'f': 0.0033528106647474805},
+                          {'lat_0': 90.0, 'lon_0': -135.0, 'proj': 'stere', 'a': 6370997.0, 'f': 0.0}):
+            self.assertTrue(_PolarStereographic.supports(proj_dict))
+            p, native = Proj(proj_dict, preserve_units=True), _PolarStereographic(proj_dict)
+            long, lat = native(x, y, inverse=True, errcheck=True)
+            # Sub-millimetre agreement with PROJ both ways.
+            np.testing.assert_allclose(p(long, lat), (x, y), rtol=0, atol=1e-3)
+            np.testing.assert_allclose(native(*p(x, y, inverse=True)), (x, y), rtol=0, atol=1e-3)
+            self.assertEqual(p(0, 0, inverse=True), native(0, 0, inverse=True))
+            out = np.empty(x.shape), np.empty(x.shape)
+            self.assertIs(out, native(x, y, inverse=True, out=out))
+            np.testing.assert_array_equal((long, lat), out)
+        self.assertFalse(_PolarStereographic.supports({'proj': 'stere', 'lat_0': 45.0, 'a': 6378137.0, 'f': 0.0}))
+        # proj_dict as newer pyresample makes it from a CRS.
+        proj_dict = {'proj': 'stere', 'lat_0': 90, 'lat_ts': 60, 'lon_0': 0, 'x_0': 0, 'y_0': 0, 'ellps': 'WGS84',
+                     'units': 'm', 'no_defs': None, 'type': 'crs'}
+        np.testing.assert_allclose(Proj(proj_dict)(x, y, inverse=True),
+                                   _PolarStereographic(proj_dict)(x, y, inverse=True), rtol=0, atol=1e-9)
+        for changed in ({'x_0': 100}, {'units': 'km'}, {'ellps': 'unknown'}):
+            self.assertFalse(_PolarStereographic.supports(dict(proj_dict, **changed)))
+        # Areas use it.
+        with mock.patch.object(_PolarStereographic, '_inverse', autospec=True,
+                               side_effect=_PolarStereographic._inverse) as inverse:
+            lat_long(60, 90, 0, shape=(5, 7), pixel_size=4000)
+        self.assertTrue(inverse.called)
+        j, i = position_to_pixel(60, 90, 0, *lat_long(60, 90, 0, shape=(5, 7), pixel_size=4000, j=3, i=5),
+                                 shape=(5, 7), pixel_size=4000)
+        self.assertAlmostEqual(3, j, 9)
+        self.assertAlmostEqual(5, i, 9)
+
+    def test_meridian_arc(self):
+        lat = np.linspace(-90, 90, 1801)
+        zeros = np.zeros(lat.shape)
+        for ellipsoid in (Geod(ellps='WGS84'), Geod(ellps='sphere'), Geod(a=6371000, f=0.01)):
+            arc = _meridian_arc(lat, ellipsoid)
+            np.testing.assert_allclose(np.sign(lat) * ellipsoid.inv(zeros, zeros, zeros, lat)[-1], arc, rtol=0,
+                                       atol=1e-6)
+            np.testing.assert_allclose(lat, _meridian_latitude(arc, ellipsoid), rtol=0, atol=1e-10)
+            # Past a pole.
+            distance = np.linspace(-3e7, 3e7, 101)
+            np.testing.assert_allclose(ellipsoid.fwd(zeros[:101], zeros[:101] + 45, zeros[:101], distance)[1],
+                                       _meridian_latitude(_meridian_arc(45, ellipsoid) + distance, ellipsoid),
+                                       rtol=0, atol=1e-9)
+
+    def test_rhumb_lines(self):
+        random = np.random.RandomState(0)
+        old_lat, old_long = random.uniform(-89, 89, 1000), random.uniform(-180, 180, 1000)
+        new_lat, new_long = old_lat + random.normal(0, 1, 1000), old_long + random.normal(0, 1, 1000)
+        # Same latitude, same position, staying at and leaving a pole, and crossing the antimeridian.
+        new_lat[:2], new_long[1], old_lat[2:5], new_lat[2], new_long[5] = old_lat[:2], old_long[1], 90, 90, 540
+        ellipsoid = Geod(ellps='WGS84')
+        names = ('distance', 'forward_bearing', 'back_bearing', 'speed', 'angle', 'v', 'u')
+        results = _rhumb_lines(old_lat, old_long, new_lat, new_long, ellipsoid, names, delta_time=100)
+        with mock.patch('pywinds.wind_functions._RHUMB_BLOCK', 7):
+            for result, blocked in zip(results, _rhumb_lines(old_lat, old_long, new_lat, new_long, ellipsoid, names,
+                                                             delta_time=100)):
+                np.testing.assert_array_equal(result, blocked)
+            for result, threaded in zip(results, _rhumb_lines(old_lat, old_long, new_lat, new_long, ellipsoid, names,
+                                                              delta_time=100, workers=3)):
+                np.testing.assert_array_equal(result, threaded)
+        distance, forward_bearing, back_bearing, speed, angle, v, u = results
+        np.testing.assert_array_equal(forward_bearing, angle)
+        np.testing.assert_allclose((forward_bearing - back_bearing) % 360, 180)
+        np.testing.assert_allclose(distance / 6000, speed, rtol=1e-15)
+        np.testing.assert_allclose(np.cos(np.radians(angle)) * speed, v, rtol=1e-9, atol=1e-9)
+        np.testing.assert_allclose(np.sin(np.radians(angle)) * speed, u, rtol=1e-9, atol=1e-9)
+        self.assertEqual((0, 0), (distance[1], distance[2]))
+        out = {'v': np.empty((10, 100), dtype=np.float32)}
+        v_32 = _rhumb_lines(old_lat.reshape(10, 100), old_long.reshape(10, 100), new_lat.reshape(10, 100),
+                            new_long.reshape(10, 100), ellipsoid, ('v',), delta_time=100, out=out)[0]
+        self.assertIs(out['v'], v_32)
+        np.testing.assert_allclose(v.reshape(10, 100), v_32, rtol=1e-6, atol=1e-6)
+
+    def test_workers(self):
+        displacement_data = (np.arange(800).reshape(2, 400) % 7).tolist()
+        random = np.random.RandomState(0)
+        positions = random.uniform(-89, 89, 1000), random.uniform(-180, 180, 1000), random.uniform(-89, 89, 1000), \
+            random.uniform(-180, 180, 1000)
+        # Small chunks so that every thread gets some.
+        with mock.patch('pywinds.wind_functions._PROJECT_BLOCK', 30), \
+                mock.patch('pywinds.wind_functions._RHUMB_BLOCK', 17):
+            for lat_0, projection in ((90, 'stere'), (60, 'laea')):
+                kwargs = dict(displacement_data=displacement_data, projection=projection, pixel_size=10000,
+                              center=[lat_0, 5])
+                np.testing.assert_array_equal(lat_long(60, lat_0, 0, **kwargs),
+                                              lat_long(60, lat_0, 0, workers=3, **kwargs))
+                np.testing.assert_array_equal(wind_info(60, lat_0, 0, 100, no_save=True, **kwargs),
+                                              wind_info(60, lat_0, 0, 100, no_save=True, workers=3, **kwargs))
+            for result, threaded in zip(geodesic_bck(*positions), geodesic_bck(*positions, workers=3)):
+                np.testing.assert_array_equal(result, threaded)
+            # Threads keep their Projs between calls, so at most one is made per thread of the shared pool.
+            area_definition = mock.Mock(proj_dict={'proj': 'laea', 'lat_0': 60, 'lon_0': 0, 'ellps': 'WGS84'})
+            x, y = random.uniform(-1e6, 1e6, (2, 1000))
+            with mock.patch('pywinds.wind_functions.Proj', wraps=Proj) as proj:
+                for _ in range(10):
+                    wind_functions._inverse_project(area_definition, x, y, workers=3)
+            self.assertLessEqual(proj.call_count, wind_functions._shared_thread_pool(3)._max_workers)
+        with self.assertRaises(ValueError):
+            lat_long(60, 90, 0, shape=[5, 5], pixel_size=10000, workers=0)
+
+    def test_ellipsoid_units(self):
+        meters = loxodrome_bck(20, 20, 40, 40, earth_ellipsoid={'a': 6371000, 'b': 6371000})
+        kilometers = loxodrome_bck(20, 20, 40, 40, earth_ellipsoid={'a': xarray.DataArray(6371, attrs={'units': 'km'}),
+                                                                    'b': xarray.DataArray(6371, attrs={'units': 'km'})})
+        np.testing.assert_allclose(meters, kilometers)
+
+    def test_lazy_imports(self):
+        # Run in a new interpreter, since this one has imported everything already.
+        code = """
+import json, sys, time
+start = time.perf_counter()
+from pywinds import wind_functions, wrapper_utils
+seconds = time.perf_counter() - start
+wind_functions.loxodrome_bck(20, 20, 40, 40)
+wind_functions.geodesic_bck(20, 20, 40, 40)
+wind_functions.wind_info_fll(100, 20, 20, 40, 40)
+print(json.dumps({'seconds': seconds,
+                  'loaded': [name for name in ('xarray', 'pyresample', 'netCDF4', 'pandas') if name in sys.modules]}))
+"""
+        root = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..')
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join([root] + os.environ.get('PYTHONPATH', '').split(os.pathsep)))
+        result = json.loads(subprocess.check_output([sys.executable, '-c', code], env=env).decode('utf-8'))
+        self.assertEqual([], result['loaded'])
+        # Importing numpy and pyproj takes about a tenth of a second, xarray and pyresample another half.
+        self.assertLess(result['seconds'], 5)
 
     # TODO: IMPLEMENT THIS AND OTHER TESTS FOR ALL FUNCTIONS
     def test_loxodrome(self):
@@ -1,11 +1,20 @@
 #!/usr/bin/env python
 import ast
+import json
 import os
+import shutil
+import socket
 import subprocess
+import sys
+import tempfile
+import threading
+import time
 import unittest
 
 import numpy as np
 
+from pywinds import worker
+from pywinds.wrapper_utils import _make_parser, _shared_area
 from pywinds.wind_functions import area, displacements
 
 
@@ -92,6 +101,189 @@ class TestWrappers(unittest.TestCase):
             self.assertEqual(v[case.j, case.i], v_ji)
             self.assertEqual(u[case.j, case.i], u_ji)
 
+    def test_jobs(self):
+        case = self.test_cases[0]
+        files = os.path.join(os.path.dirname(case.displacement_data), '*.flo')
+        commands = [os.path.join(self.root, 'wind_info.sh'), case.lat_ts, case.lat_0, case.long_0, case.delta_time,
+                    '--displacement-data', files, '--pixel-size', case.pixel_size, '-p']
+        output = args_to_data(commands)
+        self.assertEqual(2, len(output.splitlines()))
+        self.assertEqual(output, args_to_data(commands + ['--jobs', 2]))
+        process = subprocess.run(list(map(str, commands + ['--jobs', 0])), stderr=subprocess.PIPE)
+        self.assertEqual(2, process.returncode)
+        self.assertIn('--jobs: expected an int of at least 1', process.stderr.decode('utf-8'))
+        # Files that cannot be read report their own error, but an area that cannot be made stops the batch.
+        area_commands = dict(lat_ts=case.lat_ts, lat_0=case.lat_0, long_0=case.long_0, pixel_size=case.pixel_size)
+        self.assertEqual({}, _shared_area(dict(area_commands, displacement_data='missing.flo'), {}))
+        with self.assertRaises(ValueError):
+            _shared_area(dict(area_commands, displacement_data=case.displacement_data, center=[90, 0, 0]), {})
+
+    def test_profile_out(self):
+        case = self.test_cases[0]
+        profile_directory = tempfile.mkdtemp()
+        profile_path = os.path.join(profile_directory, 'profile.json')
+        try:
+            args_to_data([os.path.join(self.root, 'wind_info.sh'), case.lat_ts, case.lat_0, case.long_0,
+                          case.delta_time, '--displacement-data', case.displacement_data, '--pixel-size',
+                          case.pixel_size, '-p', '--profile-out', profile_path])
+            with open(profile_path) as file:
+                profile = json.load(file)
+        finally:
+            shutil.rmtree(profile_directory)
+        self.assertEqual('wind_info', profile['function'])
+        self.assertLess(0, profile['stages']['projection']['calls'])
+        self.assertLess(0, profile['stages']['loxodrome']['calls'])
+
+    def test_worker(self):
+        case = self.test_cases[0]
+        commands = [os.path.join(self.root, 'wind_info.sh'), case.lat_ts, case.lat_0, case.long_0, case.delta_time,
+                    '--displacement-data', case.displacement_data, '--pixel-size', case.pixel_size, '-p']
+        socket_directory = tempfile.mkdtemp()
+        socket_path = os.path.join(socket_directory, 'worker.sock')
+        log_path = os.path.join(socket_directory, 'worker.log')
+        grid_directory = os.path.join(socket_directory, 'grids')
+        with open(log_path, 'w') as log:
+            server = subprocess.Popen([sys.executable, '-m', 'pywinds.worker', 'serve', '--socket', socket_path],
+                                      stderr=log)
+        old_environment = dict(os.environ)
+        os.environ['PYWINDS_WORKER_SOCKET'] = socket_path
+        try:
+            for _ in range(600):
+                if os.path.exists(socket_path) or server.poll() is not None:
+                    break
+                time.sleep(.1)
+            self.assertIsNone(server.poll())
+            # The grid cache of the client is used, not that of the worker.
+            os.environ['PYWINDS_GRID_CACHE'] = grid_directory
+            output = args_to_data(commands)
+            self.assertEqual(1, len(os.listdir(grid_directory)))
+            with open(log_path) as log:
+                self.assertIn('Ran a script in {0}'.format(os.getcwd()), log.read())
+            self.assertIsNone(server.poll())
+            # stdin is the client's, so the client runs this itself.
+            self.assertEqual(b'2928536.30,40.79,220.79\n', subprocess.check_output(
+                [os.path.join(self.root, 'loxodrome.sh'), '--input', '-'], input=b'20 20 40 40\n'))
+            os.environ['PYWINDS_NO_WORKER'] = '1'
+            np.testing.assert_array_equal(output, args_to_data(commands))
+            responses = worker.request([{'function': 'loxodrome_bck', 'id': 0,
+                                         'kwargs': {'old_lat': 20, 'old_long': 20, 'new_lat': 40, 'new_long': 40}},
+                                        {'function': '_find_displacements', 'kwargs': {}}], socket_path)
+            self.assertEqual(0, responses[0]['id'])
+            self.assertAlmostEqual(2928536.3, responses[0]['result'][0], 1)
+            self.assertIn('ValueError', responses[1]['error'])
+            # Clients are served side by side: the first script only ends once the second has run.
+            flag_path = os.path.join(socket_directory, 'flag')
+            waiting = threading.Thread(target=lambda: responses.append(worker.request([{'script': (
+                'import os, time\nfor _ in range(600):\n    if os.path.exists({0!r}):\n        break\n'
+                '    time.sleep(.1)\nprint(os.path.exists({0!r}))').format(flag_path)}], socket_path)))
+            waiting.start()
+            worker.request([{'script': 'open({0!r}, "w").close()'.format(flag_path)}], socket_path)
+            waiting.join(90)
+            self.assertEqual('True\n', responses[-1][0]['stdout'])
+            # Others could swap the socket for their own.
+            os.chmod(socket_directory, 0o777)
+            self.assertIsNone(worker.request([{'shutdown': True}], socket_path))
+            os.chmod(socket_directory, 0o700)
+            self.assertEqual(0, worker.request([{'shutdown': True}], socket_path)[0]['status'])
+            self.assertEqual(0, server.wait(60))
+            self.assertFalse(os.path.exists(socket_path))
+        finally:
+            os.environ.clear()
+            os.environ.update(old_environment)
+            if server.poll() is None:
+                server.kill()
+            shutil.rmtree(socket_directory)
+
+    def test_worker_closed(self):
+        socket_directory = tempfile.mkdtemp()
+        socket_path = os.path.join(socket_directory, 'worker.sock')
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            listener.bind(socket_path)
+            os.chmod(socket_path, 0o600)
+            listener.listen(4)
+
+            def close_connections():
+                for _ in range(2):
+                    listener.accept()[0].close()
+            closing = threading.Thread(target=close_connections)
+            closing.start()
+            # A worker that closes the connection without responding is not listening, so scripts run themselves.
+            self.assertIsNone(worker.request([{'function': 'loxodrome_bck', 'kwargs': {}}], socket_path))
+            self.assertEqual([2928536.3, 40.79, 220.79], args_to_data(
+                ['env', 'PYWINDS_WORKER_SOCKET=' + socket_path, os.path.join(self.root, 'loxodrome.sh'),
+                 20, 20, 40, 40]).tolist())
+            closing.join(60)
+            self.assertFalse(closing.is_alive())
+        finally:
+            listener.close()
+            shutil.rmtree(socket_directory)
+
+    def test_parse_args(self):
+        names = ['--pixel-size', '--center', '--earth-ellipsoid', '-p', 'old-lat', 'old-long', 'distance',
+                 'forward-bearing']
+
+        def parse(command):
+            argv = command.split(' ')
+            return vars(_make_parser(list(names), 'test', argv).parse_args(argv))
+        commands = parse('20 20 1000 km 45 --pixel-size 4 km --center 90 0 --earth-ellipsoid a 6371 km b 6300 -p')
+        self.assertEqual(4, commands['pixel_size'].data)
+        self.assertEqual('km', commands['pixel_size'].attrs['units'])
+        self.assertEqual([90, 0], commands['center'])
+        self.assertEqual('km', commands['earth_ellipsoid']['a'].attrs['units'])
+        self.assertEqual(6300, commands['earth_ellipsoid']['b'])
+        self.assertEqual(1000, commands['distance'].data)
+        self.assertEqual(45, commands['forward-bearing'])
+        self.assertTrue(commands['no_save'])
+        # Values that do not fit any form of a flag are left to the positional arguments.
+        commands = parse('--pixel-size 4 5 --earth-ellipsoid WGS84 -p 20 -20 1000 45')
+        self.assertEqual([4, 5], commands['pixel_size'])
+        self.assertEqual('WGS84', commands['earth_ellipsoid'])
+        self.assertEqual([20, -20, 1000, 45], [commands['old-lat'], commands['old-long'], commands['distance'],
+                                               commands['forward-bearing']])
+
+    def test_input(self):
+        points = [[20, 20, 40, 40], [10, 10, -30, 50], [-60, 170, -55, -170]]
+        loxodrome = os.path.join(self.root, 'loxodrome.sh')
+        expected = [args_to_data([loxodrome] + point) for point in points]
+        directory = tempfile.mkdtemp()
+        try:
+            csv_path = os.path.join(directory, 'points.csv')
+            with open(csv_path, 'w') as file:
+                file.write('# old_lat, old_long, new_lat, new_long\n')
+                file.writelines(','.join(map(str, point)) + '\n' for point in points)
+            np.testing.assert_array_equal(expected, csv_to_data([loxodrome, '--input', csv_path]))
+            with open(csv_path, 'rb') as file:
+                output = subprocess.check_output([loxodrome, '--input', '-'], stdin=file).decode('utf-8')
+            np.testing.assert_array_equal(expected, np.loadtxt(output.splitlines(), delimiter=','))
+            bin_path, out_path = os.path.join(directory, 'points.bin'), os.path.join(directory, 'out.bin')
+            np.array(points, dtype='<f8').tofile(bin_path)
+            args_to_data([loxodrome, '--input', bin_path, '--output', out_path])
+            np.testing.assert_allclose(expected, np.fromfile(out_path, dtype='<f8').reshape(-1, 3), atol=.005)
+            # Errors name the line of the file, after the rows before it are written.
+            for bad_line, message in (('20 20 x 40', 'not a number'), ('20 20 40', '3 values instead of 4')):
+                with open(csv_path, 'w') as file:
+                    file.write('# old_lat, old_long, new_lat, new_long\n20,20,40,40\n\n10,10,-30,50\n')
+                    file.write(bad_line + '\n-60,170,-55,-170\n')
+                process = subprocess.run([loxodrome, '--input', csv_path], stdout=subprocess.PIPE,
+                                         stderr=subprocess.PIPE)
+                self.assertNotEqual(0, process.returncode)
+                self.assertIn('Line 5 of the input', process.stderr.decode('utf-8'))
+                self.assertIn(message, process.stderr.decode('utf-8'))
+                np.testing.assert_array_equal(expected[:2], np.loadtxt(process.stdout.decode('utf-8').splitlines(),
+                                                                       delimiter=','))
+            case = self.test_cases[0]
+            area_args = [case.lat_ts, case.lat_0, case.long_0, '--pixel-size', case.pixel_size, '--shape'] + \
+                case.shape + ['--center'] + case.center
+            position_to_pixel = os.path.join(self.root, 'position_to_pixel.sh')
+            with open(csv_path, 'w') as file:
+                file.write('80 45\n70 10\n')
+            np.testing.assert_array_equal([args_to_data([position_to_pixel] + area_args + [80, 45]),
+                                           args_to_data([position_to_pixel] + area_args + [70, 10])],
+                                          csv_to_data([position_to_pixel, '--input', csv_path] + area_args))
+        finally:
+            shutil.rmtree(directory)
+
     def test_velocity(self):
         for case in self.test_cases:
             speed_ji, angle_ji = args_to_data(
@@ -194,6 +386,11 @@ def args_to_data(commands):
         return output
 
 
+def csv_to_data(commands):
+    """Rows of the CSV that a script run with --input printed."""
+    return np.loadtxt(args_to_data(commands).splitlines(), delimiter=',', ndmin=2)
+
+
 def suite():
     """The test suite for test_wrappers."""
     loader = unittest.TestLoader()
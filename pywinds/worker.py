@@ -0,0 +1,373 @@
+"""Long-lived worker that runs pywinds requests without starting python and importing numpy, xarray, pyproj, and
+pyresample for each of them. Each connection is served by a process forked from the worker, so connections run side
+by side, and the requests of one connection share the caches of areas, projections, and ellipsoids of wind_functions.
+
+    python -m pywinds.worker serve [--socket path | --stdio]
+    python -m pywinds.worker stop [--socket path]
+
+Requests and responses are JSON lines. Two kinds of request are accepted:
+
+* {"function": "loxodrome_bck", "kwargs": {...}}: calls a public function of wind_functions with kwargs (the
+  keyword arguments that run_script builds) and responds with {"result": ...}, arrays as lists
+* {"script": "python source", "cwd": "...", "environment": {...}}: runs the python that a script in
+  make_env/run_scripts pipes to python, in cwd and with the PYWINDS_ environment variables of environment (those of
+  the worker when it is not given), and responds with its {"stdout": ..., "stderr": ..., "status": exit status}.
+  Scripts that stream points through stdin or stdout (--input) are responded to with {"client": true} instead: only
+  the client has those streams
+
+Any other key of a request is sent back, so "id" can be used to match responses to requests. Failures are responded
+to with {"error": "Type: message"} and do not stop the worker.
+
+The scripts in make_env/run_scripts give their python to ``python -m pywinds.worker run`` on file descriptor 3,
+which sends it to the worker when one is listening on the socket and otherwise runs it in its own process exactly as
+before. Scripts that stream points through stdin or stdout also run in the client's process. Only the
+standard library is imported until a request is run.
+
+Script requests run any python as the user who started the worker, so the worker only listens in a directory that no
+one else can write to and turns away connections from other users, and clients only connect to sockets of their own.
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import selectors
+import socketserver
+import stat
+import struct
+import sys
+import tempfile
+import traceback
+import warnings
+
+logger = logging.getLogger(__name__)
+
+
+def _uid():
+    return os.getuid() if hasattr(os, 'getuid') else 0
+
+
+def _is_private(path):
+    """Whether path is owned by the user and only the user can write to it or, for a socket, connect to it."""
+    try:
+        status = os.lstat(path)
+    except OSError:
+        return False
+    return status.st_uid == _uid() and not status.st_mode & 0o077
+
+
+def _private_directory(path):
+    """Creates the directory path that only the user can enter, unless it exists. Raises if someone else can write
+    to it, since they could then swap the socket in it for their own."""
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    if not stat.S_ISDIR(os.lstat(path).st_mode) or not _is_private(path):
+        raise PermissionError('{0} must be a directory that only its owner can write to'.format(path))
+    return path
+
+
+def default_socket():
+    """UNIX socket that the worker listens on: PYWINDS_WORKER_SOCKET, else pywinds-worker.sock in XDG_RUNTIME_DIR,
+    else in pywinds-<uid> of the temporary directory."""
+    return os.environ.get('PYWINDS_WORKER_SOCKET') or os.path.join(
+        os.environ.get('XDG_RUNTIME_DIR') or os.path.join(tempfile.gettempdir(), 'pywinds-{0}'.format(_uid())),
+        'pywinds-worker.sock')
+
+
+def _to_json(value):
+    """Converts the numpy and xarray objects that pywinds returns to JSON types."""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if hasattr(value, 'values'):
+        return _to_json(value.values)
+    return str(value)
+
+
+class _ClientNeeded(Exception):
+    """Raised when a script run by the worker reads stdin or writes bytes to stdout, which belong to the client."""
+
+
+class _NoStdin(io.TextIOBase):
+    """sys.stdin of scripts run by the worker."""
+
+    def _needed(self, *args, **kwargs):
+        raise _ClientNeeded
+
+    read = readline = readlines = __iter__ = _needed
+
+    @property
+    def buffer(self):
+        raise _ClientNeeded
+
+
+class _CapturedStdout(io.StringIO):
+    """sys.stdout of scripts run by the worker, which only takes text."""
+
+    @property
+    def buffer(self):
+        raise _ClientNeeded
+
+
+def _run_function(name, kwargs):
+    from pywinds import wind_functions
+
+    func = getattr(wind_functions, name, None)
+    if name.startswith('_') or not callable(func) or getattr(func, '__module__', None) != wind_functions.__name__:
+        raise ValueError('{0} is not a function of pywinds.wind_functions'.format(name))
+    return {'result': json.loads(json.dumps(func(**kwargs), default=_to_json))}
+
+
+def _pywinds_environment():
+    """The PYWINDS_ environment variables, which change what scripts do."""
+    return {key: val for key, val in os.environ.items() if key.startswith('PYWINDS_')}
+
+
+def _run_script(source, cwd=None, environment=None):
+    """Runs the python of a script as if it were piped to python in cwd, with the PYWINDS_ environment variables of
+    environment when given. Output is captured instead of printed."""
+    stdout, stderr = _CapturedStdout(), io.StringIO()
+    status = 0
+    old_cwd, old_argv, old_stdin = os.getcwd(), sys.argv, sys.stdin
+    old_environment = _pywinds_environment()
+    # basicConfig only sets up logging if the root logger has no handlers, which would leave them writing to the
+    # captured output of an earlier request.
+    handlers, level = logging.root.handlers[:], logging.root.level
+    logging.root.handlers[:] = []
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr), warnings.catch_warnings():
+            # Like the scripts' python -W ignore.
+            warnings.simplefilter('ignore')
+            try:
+                if cwd is not None:
+                    os.chdir(cwd)
+                if environment is not None:
+                    _set_pywinds_environment(environment)
+                sys.stdin = _NoStdin()
+                exec(compile(source, '<stdin>', 'exec'), {'__name__': '__main__'})
+            except _ClientNeeded:
+                # Streams are opened before any output is written, so the client can run the script from the start.
+                return {'client': True}
+            except SystemExit as error:
+                status = error.code if isinstance(error.code, int) else 0 if error.code is None else 1
+                if not isinstance(error.code, (int, type(None))):
+                    print(error.code, file=sys.stderr)
+            except Exception:
+                traceback.print_exc()
+                status = 1
+    finally:
+        os.chdir(old_cwd)
+        sys.argv, sys.stdin = old_argv, old_stdin
+        _set_pywinds_environment(old_environment)
+        logging.root.handlers[:] = handlers
+        logging.root.setLevel(level)
+    logger.info('Ran a script in {0} with exit status {1}'.format(cwd, status))
+    return {'stdout': stdout.getvalue(), 'stderr': stderr.getvalue(), 'status': status}
+
+
+def _set_pywinds_environment(environment):
+    """Replaces the PYWINDS_ environment variables with those of environment."""
+    for key in _pywinds_environment():
+        del os.environ[key]
+    os.environ.update({key: str(val) for key, val in environment.items() if key.startswith('PYWINDS_')})
+
+
+def handle(request):
+    """Runs one request (a dict) and returns the response (a dict)."""
+    response = {key: val for key, val in request.items()
+                if key not in ('function', 'kwargs', 'script', 'cwd', 'environment')}
+    try:
+        if 'function' in request:
+            response.update(_run_function(request['function'], request.get('kwargs') or {}))
+        elif 'script' in request:
+            response.update(_run_script(request['script'], request.get('cwd'), request.get('environment')))
+        else:
+            raise ValueError('Requests need a function or a script')
+    except Exception as error:
+        response['error'] = '{0}: {1}'.format(type(error).__name__, error)
+    return response
+
+
+def _serve_lines(lines, write):
+    """Responds to each JSON line of lines with write(response line). Returns True if asked to shut down."""
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if not line.strip():
+            continue
+        try:
+            request = json.loads(line)
+        except ValueError as error:
+            write(json.dumps({'error': 'Invalid JSON: {0}'.format(error)}) + '\n')
+            continue
+        if request.get('shutdown'):
+            write(json.dumps({'status': 0}) + '\n')
+            return True
+        write(json.dumps(handle(request)) + '\n')
+    return False
+
+
+class _Handler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # The socket is already private, but requests run code as the user, so other users are turned away even if
+        # it is placed somewhere they can reach.
+        if hasattr(socket, 'SO_PEERCRED'):
+            credentials = self.connection.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i'))
+            if struct.unpack('3i', credentials)[1] != _uid():
+                return
+        def write(line):
+            self.wfile.write(line.encode('utf-8'))
+            self.wfile.flush()
+        if _serve_lines(self.rfile, write):
+            # Handled in a forked process, so the server is told through its pipe.
+            os.write(self.server.shutdown_pipe, b'1')
+
+
+class _Server(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    """Serves each connection in a forked process. Scripts run side by side, as they do without the worker, and each
+    starts from the imports of the worker without changing its state."""
+
+
+def _warm_up():
+    """Imports what requests use, so that the first request is as fast as the rest. pywinds only imports xarray,
+    pyresample, and netCDF4 when a call needs them, so they are imported here too."""
+    import netCDF4
+    import numpy
+    import xarray
+    from pyresample import area_config, geometry, utils
+    from pywinds import wind_functions, wrapper_utils
+
+
+def serve(path=None):
+    """Listens on the UNIX socket path, serving each connection in a forked process, until asked to shut down."""
+    path = path or default_socket()
+    _private_directory(os.path.dirname(os.path.abspath(path)))
+    if os.path.lexists(path):
+        if _connect(path) is not None:
+            raise RuntimeError('A worker is already listening on {0}'.format(path))
+        # Left behind by a worker that did not shut down cleanly.
+        os.remove(path)
+    _warm_up()
+    # Only the user can connect.
+    old_umask = os.umask(0o177)
+    try:
+        server = _Server(path, _Handler)
+    finally:
+        os.umask(old_umask)
+    shutdown_pipe, server.shutdown_pipe = os.pipe()
+    logger.info('pywinds worker listening on {0}'.format(path))
+    try:
+        with selectors.DefaultSelector() as selector:
+            selector.register(server, selectors.EVENT_READ)
+            selector.register(shutdown_pipe, selectors.EVENT_READ)
+            while True:
+                ready = [key.fileobj for key, events in selector.select(timeout=1)]
+                server.collect_children()
+                if shutdown_pipe in ready:
+                    break
+                if server in ready:
+                    server.handle_request()
+    finally:
+        # Waits for the connections that are still being served.
+        server.server_close()
+        os.remove(path)
+        os.close(shutdown_pipe)
+        os.close(server.shutdown_pipe)
+
+
+def serve_stdio():
+    """Responds to the JSON lines of stdin on stdout until stdin closes or the worker is asked to shut down."""
+    _warm_up()
+    stdout = sys.stdout
+
+    def write(line):
+        stdout.write(line)
+        stdout.flush()
+    _serve_lines(sys.stdin, write)
+
+
+def _connect(path):
+    """Socket connected to the worker at path, or None if no worker is listening there. Sockets that the user does not
+    own, or that are in a directory that others can write to, are never connected to: whoever made them would be sent
+    the scripts and could answer them."""
+    if not hasattr(socket, 'AF_UNIX') or not _is_private(os.path.dirname(os.path.abspath(path))):
+        return None
+    if not _is_private(path) or not stat.S_ISSOCK(os.lstat(path).st_mode):
+        return None
+    connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        connection.connect(path)
+    except OSError:
+        connection.close()
+        return None
+    return connection
+
+
+def request(requests, path=None):
+    """Sends requests (dicts) to the worker at path and returns its responses, or None if no worker is listening or it
+    closed the connection without responding."""
+    connection = _connect(path or default_socket())
+    if connection is None:
+        return None
+    responses = []
+    try:
+        with connection, connection.makefile('rwb') as file:
+            for item in requests:
+                file.write((json.dumps(item) + '\n').encode('utf-8'))
+                file.flush()
+                line = file.readline()
+                if not line:
+                    # The worker turned the connection away, or stopped before it responded.
+                    return None
+                responses.append(json.loads(line.decode('utf-8')))
+    except OSError:
+        return None
+    return responses
+
+
+def run(source):
+    """Runs the python of a script on the worker when one is listening, else in this process. Returns the exit
+    status."""
+    if not os.environ.get('PYWINDS_NO_WORKER'):
+        responses = request([{'script': source, 'cwd': os.getcwd(), 'environment': _pywinds_environment()}])
+        if responses is not None and not responses[0].get('client'):
+            response = responses[0]
+            sys.stdout.write(response.get('stdout', ''))
+            sys.stderr.write(response.get('stderr', ''))
+            if 'error' in response:
+                sys.stderr.write('pywinds worker: {0}\n'.format(response['error']))
+                return 1
+            return response['status']
+    exec(compile(source, '<stdin>', 'exec'), {'__name__': '__main__'})
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('action', choices=['serve', 'stop', 'run'],
+                        help='serve requests, stop the worker, or run the python of a script')
+    parser.add_argument('--source-fd', type=int, default=0,
+                        help='file descriptor that run reads the python of the script from. Defaults to stdin')
+    parser.add_argument('--socket', help='UNIX socket of the worker. Defaults to {0}'.format(default_socket()))
+    parser.add_argument('--stdio', action='store_true', help='serve the JSON lines of stdin instead of a socket')
+    args = parser.parse_args()
+    if args.action == 'run':
+        with open(args.source_fd, closefd=args.source_fd != 0) as source:
+            sys.exit(run(source.read()))
+    if args.action == 'stop':
+        if request([{'shutdown': True}], args.socket) is None:
+            sys.exit('No pywinds worker is listening on {0}'.format(args.socket or default_socket()))
+        return
+    logging.basicConfig(level=logging.INFO, format='[%(levelname)s: %(asctime)s : %(name)s] %(message)s',
+                        datefmt='%Y-%m-%d %H:%M:%S')
+    if args.stdio:
+        serve_stdio()
+    else:
+        serve(args.socket)
+
+
+if __name__ == '__main__':
+    main()
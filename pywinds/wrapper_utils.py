@@ -1,15 +1,18 @@
 """Convert command line arguments to python arguments for wind_functions.py"""
 import argparse
 import ast
-import copy
+import contextlib
 import datetime
+import itertools
+import json
 import logging
 import numpy as np
 import os
+import re
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from glob import glob
 
-import xarray
-
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +26,14 @@ def area_to_string(area_dict, round_nums=None):
     return write_string[:-1]
 
 
+def _with_units(value, units):
+    """Attaches units to value as an xarray.DataArray. xarray is only imported once units are given."""
+    from pywinds.wind_functions import _xarray
+
+    xarray = _xarray()
+    return xarray.DataArray(value, attrs={'units': units})
+
+
 def _nums_or_string(var):
     """Converts strings to number like python objects, and leaves as default type if unable to convert."""
     try:
@@ -31,17 +42,120 @@ def _nums_or_string(var):
         return var
 
 
-class NullParser(argparse.ArgumentParser):
-    """Used to nullify error output."""
+def _pixel_index(var):
+    """Converts 'start:stop[:step]' to a slice and 'a,b,c' to a list of pixels; anything else is left to
+    _nums_or_string."""
+    if isinstance(var, str) and ':' in var:
+        return slice(*[int(num) if num else None for num in var.split(':')])
+    var = _nums_or_string(var)
+    if isinstance(var, tuple):
+        return list(var)
+    return var
 
-    def print_usage(self, *args, **kwargs):
-        return
 
-    def print_help(self, *args, **kwargs):
-        return
+def _packing(var):
+    """Converts 'name:scale_factor[:add_offset],...' to {name: (scale_factor, add_offset)}. add_offset defaults to 0."""
+    packing = {}
+    for item in var.split(','):
+        name, *numbers = item.split(':')
+        try:
+            numbers = [float(number) for number in numbers]
+        except ValueError:
+            numbers = []
+        if not name or len(numbers) not in (1, 2):
+            raise argparse.ArgumentTypeError('expected name:scale_factor[:add_offset], got {0}'.format(item))
+        packing[name] = (numbers[0], numbers[1] if len(numbers) == 2 else 0.0)
+    return packing
+
+
+def _positive_int(var):
+    """Converts var to an int of at least 1, like the counts of processes and threads must be."""
+    try:
+        number = int(var)
+    except ValueError:
+        number = 0
+    if number < 1:
+        raise argparse.ArgumentTypeError('expected an int of at least 1, got {0}'.format(var))
+    return number
+
+
+# What argparse reads as a negative number instead of an option.
+_NEGATIVE_NUMBER = re.compile(r'^-\d+$|^-\d*\.\d+$')
+# Values that each type in narg_types accepts once converted with _nums_or_string.
+_NARG_CHECKS = {float: (int, float), _nums_or_string: (int, float, str)}
+
+
+def _is_option(token):
+    """Whether argparse reads token as an option string, known or not, instead of as a value."""
+    return token.startswith('-') and token != '-' and not _NEGATIVE_NUMBER.match(token) and ' ' not in token
+
+
+def _match_narg_types(narg_types, values):
+    """nargs of a flag given the values that follow it: the longest of narg_types whose types match the start of
+    values, or the shortest if none do."""
+    values = [_nums_or_string(value) for value in values]
+    # Longest first, and later entries first among those of the same length.
+    for narg_type in reversed(sorted(narg_types, key=len)):
+        if len(narg_type) <= len(values) and all(isinstance(value, _NARG_CHECKS.get(kind, kind))
+                                                 for kind, value in zip(narg_type, values)):
+            return len(narg_type)
+    return min(len(narg_type) for narg_type in narg_types)
+
+
+def _fixed_nargs(kwargs):
+    """Number of values a flag without narg_types reads."""
+    if kwargs.get('action') in ('store_true', 'store_false', 'count'):
+        return 0
+    return kwargs.get('nargs', 1)
 
-    def exit(self, *args, **kwargs):
-        return
+
+def _scan_nargs(flags, argv):
+    """Finds the nargs of every flag with narg_types from one pass over argv.
+
+    argv is split into segments: an option and the values up to the next option. An optional flag takes nargs from
+    the values after its last occurrence; a positional one from the values from its own position to the end of its
+    segment, after the values that options and earlier positionals read.
+    """
+    options = {name: flag for flag in flags for name in flag['args'] if name.startswith('-')}
+    segments = [[None, []]]
+    positional_only = False
+    for token in argv:
+        if positional_only or not _is_option(token):
+            segments[-1][1].append(token)
+        elif token == '--':
+            positional_only = True
+            segments.append([None, []])
+        else:
+            flag = options.get(token)
+            if flag is None and token.startswith('--') and '=' not in token:
+                # Unique abbreviations of long options are allowed, like argparse does.
+                matches = {id(option): option for name, option in options.items() if name.startswith(token)}
+                flag = next(iter(matches.values())) if len(matches) == 1 else None
+            # Options given a value with '=' or that are unknown read nothing from the values after them.
+            segments.append([flag, []])
+    # Flags that are not given take the fewest values.
+    nargs = {flag['args'][0]: _match_narg_types(flag['kwargs']['narg_types'], []) for flag in flags
+             if 'narg_types' in flag['kwargs']}
+    for flag, values in segments:
+        if flag is not None and 'narg_types' in flag['kwargs']:
+            nargs[flag['args'][0]] = _match_narg_types(flag['kwargs']['narg_types'], values)
+    positionals = []
+    for flag, values in segments:
+        if flag is None:
+            positionals.append(values)
+        else:
+            positionals.append(values[nargs.get(flag['args'][0], _fixed_nargs(flag['kwargs'])):])
+    segment, index = 0, 0
+    for flag in flags:
+        if flag['args'][0].startswith('-'):
+            continue
+        while segment < len(positionals) and index >= len(positionals[segment]):
+            segment, index = segment + 1, 0
+        values = positionals[segment][index:] if segment < len(positionals) else []
+        if 'narg_types' in flag['kwargs']:
+            nargs[flag['args'][0]] = _match_narg_types(flag['kwargs']['narg_types'], values)
+        index += min(len(values), nargs.get(flag['args'][0], _fixed_nargs(flag['kwargs'])))
+    return nargs
 
 
 class MyFormatter(argparse.HelpFormatter):
@@ -63,80 +177,29 @@ class MyFormatter(argparse.HelpFormatter):
         return help_string
 
 
-class DualParser(argparse.ArgumentParser):
-    """Adds a null parser so that --help works for CustomAction"""
-
-    def __init__(self, *args, **kwargs):
-        self.null_parser = NullParser(*args, conflict_handler='resolve', **kwargs)
-        super().__init__(*args, **kwargs)
-
-    def add_argument(self, *args, **kwargs):
-        if kwargs.get('action') is None:
-            kwargs['action'] = CustomAction
-            kwargs['parser'] = self.null_parser
-        super().add_argument(*args, **kwargs)
-        self.null_parser.add_argument(*args, **kwargs)
-
-
 class CustomAction(argparse.Action):
-    """Dynamically finds correct number of nargs to use, then converts those numbers to correct python objects."""
+    """Converts values to the correct python objects: numbers, and DataArrays or dicts for values given units."""
 
-    def __init__(self, option_strings, dest, narg_types=None, parser=None, **kwargs):
+    def __init__(self, option_strings, dest, **kwargs):
         kwargs['type'] = kwargs.get('type') if kwargs.get('type') else _nums_or_string
-        # If nargs is provided or no narg_typesis provided, treat as "normal".
-        if kwargs.get('nargs') or narg_types is None:
-            if not kwargs.get('nargs'):
-                kwargs['nargs'] = 1
-            super().__init__(option_strings, dest, **kwargs)
-            return
-        narg_types.sort(key=len)
-        # If an error occurs or number of args are too small, use the bare minimum nargs.
-        default_nargs = len(narg_types[0])
-        # Setup narg_types so that larger lists take priority.
-        narg_types = list(reversed(narg_types))
-        # Setup parser to read all arguments after option.
-        parser = copy.deepcopy(parser)
-        # Find the most amount of nargs possible.
-        NullParser.add_argument(parser, *option_strings if not kwargs.get('required') else [dest], nargs='+')
-        known_args = NullParser().parse_known_args(parser.parse_known_args()[1], parser.parse_known_args()[0])
-        # Extract only arguments associated with option.
-        if known_args is not None:
-            args = getattr(known_args[0], dest)
-            if not args:
-                super().__init__(option_strings, dest, nargs=default_nargs, **kwargs)
-                return
-            args = [kwargs['type'](arg) for arg in args]
-        else:
-            super().__init__(option_strings, dest, nargs=default_nargs, **kwargs)
-            return
-        # Try to match up narg_types with args from command line.
-        for narg_type in narg_types:
-            if len(narg_type) <= len(args):
-                for i in range(len(narg_type)):
-                    narg_type[i] = (int, float) if narg_type[i] == float else narg_type[i]
-                    narg_type[i] = (int, float, str) if narg_type[i] == _nums_or_string else narg_type[i]
-                    if not isinstance(args[i], narg_type[i]):
-                        break
-                # Every type matched up:
-                else:
-                    super().__init__(option_strings, dest, nargs=len(narg_type), **kwargs)
-                    return
-        super().__init__(option_strings, dest, nargs=default_nargs, **kwargs)
+        if not kwargs.get('nargs'):
+            kwargs['nargs'] = 1
+        super().__init__(option_strings, dest, **kwargs)
 
     def __call__(self, parser, args, values, option_string=None):
         values = [_nums_or_string(value) for value in values]
         if option_string and ('ellipsoid' in option_string or 'spheroid' in option_string):
             if len(values) == 3:
-                values = {values[0]: xarray.DataArray(values[1], attrs={'units': values[2]})}
+                values = {values[0]: _with_units(values[1], values[2])}
             elif len(values) == 5:
                 if isinstance(values[3], (int, float)):
                     values = {values[0]: values[1],
-                              values[2]: xarray.DataArray(values[3], attrs={'units': values[4]})}
+                              values[2]: _with_units(values[3], values[4])}
                 else:
-                    values = {values[0]: xarray.DataArray(values[1], attrs={'units': values[2]}),
+                    values = {values[0]: _with_units(values[1], values[2]),
                               values[3]: values[4]}
             elif len(values) == 6:
-                values = {key: xarray.DataArray(val, attrs={'units': units}) for key, val, units in
+                values = {key: _with_units(val, units) for key, val, units in
                           zip(values[::3], values[-5::3], values[-4::3])}
             elif len(values) != 1:
                 values = {key: val for key, val in zip(values[::2], values[1::2])}
@@ -150,7 +213,7 @@ class CustomAction(argparse.Action):
                     if len(values) == 1:
                         values = values[0]
                 if units is not None:
-                    values = xarray.DataArray(values, attrs={'units': units})
+                    values = _with_units(values, units)
         if isinstance(values, list) and len(values) == 1:
             values = values[0]
         setattr(args, self.dest, values)
@@ -160,10 +223,12 @@ def _add_flag(dictionary, *names, **kwargs):
     dictionary.update(dict.fromkeys(names, dict(args=names, kwargs=kwargs)))
 
 
-def _make_parser(flag_names, description):
+def _make_parser(flag_names, description, argv=None):
+    """Makes the parser of a script. Flags with narg_types get the nargs that argv (sys.argv[1:] by default) gives
+    them."""
     # Adds flags that are for every script.
     flag_names = ['-v'] + flag_names + ['--precision']
-    my_parser = DualParser(description=description, formatter_class=MyFormatter)
+    my_parser = argparse.ArgumentParser(description=description, formatter_class=MyFormatter)
     flags = {}
     _add_flag(flags, '-v', '--verbose', action="count", default=0,
               help='Each occurrence increases verbosity 1 level through ERROR-WARNING-INFO-DEBUG.')
@@ -193,8 +258,12 @@ def _make_parser(flag_names, description):
     _add_flag(flags, '--from-lat-long', action="store_true",
               help='Switches to taking latitudes and longitudes as arguments. '
                    'Use the args --from-lat-long -h for more information.')
-    _add_flag(flags, '-j', '--j', metavar='int', type=int, help='row to run calculations on')
-    _add_flag(flags, '-i', '--i', metavar='int', type=int, help='column to run calculations on')
+    _add_flag(flags, '-j', '--j', metavar='int', type=_pixel_index,
+              help='row to run calculations on. start:stop or a comma separated list of rows reads and '
+                   'calculates only that window')
+    _add_flag(flags, '-i', '--i', metavar='int', type=_pixel_index,
+              help='column to run calculations on. start:stop or a comma separated list of columns reads and '
+                   'calculates only that window')
     _add_flag(flags, '--center',
               narg_types=[[float, float, str], [float, float]],
               help='projection y and x coordinate of the center of area. Default: lat long')
@@ -231,10 +300,52 @@ def _make_parser(flag_names, description):
                           [str, float, str, str, float, str]],
               help='Ellipsoid of projection. Coordinate system name or defined '
                    'using a combination of a, b, e, es, f, and rf.')
+    _add_flag(flags, '--dtype', metavar='str', choices=['float32', 'float64'],
+              help='float type to compute data in: float32 or float64. float32 uses half the memory. Defaults to '
+                   'float64.')
+    _add_flag(flags, '--block-size', metavar='int', type=int,
+              help='number of rows to read, compute, and save at a time. Bounds memory use for large images')
+    _add_flag(flags, '--max-memory', metavar='MB', type=float,
+              help='approximate memory budget in megabytes. Picks --block-size when it is not provided')
+    _add_flag(flags, '--format', metavar='str', dest='save_format', choices=['netcdf', 'raw', 'npy', 'zarr'],
+              help='binary format to save data in next to the text files: netcdf (wind_info.nc), raw (float32 files '
+                   'described by wind_info.json), npy, or zarr (wind_info.zarr). Defaults to netcdf')
+    _add_flag(flags, '--compression', metavar='int', type=int,
+              help='zlib level (0-9) to compress wind_info.nc with, after shuffling. 0 and the default are no '
+                   'compression')
+    _add_flag(flags, '--chunks', nargs=2, type=int, help='chunk shape of the variables in wind_info.nc: y x')
+    _add_flag(flags, '--pack', metavar='name:scale_factor[:add_offset],...', dest='packing', type=_packing,
+              help='variables of wind_info.nc to pack into int16 as round((value - add_offset) / scale_factor)')
+    _add_flag(flags, '--no-matrix', action='store_false', dest='save_matrix',
+              help='leave the wind_info matrix, which repeats the other variables, out of wind_info.nc')
+    _add_flag(flags, '--jobs', metavar='int', type=_positive_int,
+              help='number of displacement files to process at the same time. A failed file is reported without '
+                   'stopping the others')
+    _add_flag(flags, '--threads', metavar='int', type=_positive_int, dest='workers',
+              help='number of threads to split the pixels of each file between for the projection and rhumb line '
+                   'math. Defaults to 1')
+    _add_flag(flags, '--profile-out', metavar='path-name',
+              help='write the time and peak memory of each stage (area, displacements, projection, loxodrome, '
+                   'saving, text formatting) to this JSON file')
+    _add_flag(flags, '--input', metavar='path-name',
+              help='CSV or raw float64 file, or - for stdin, of points to run instead of the one on the command line: '
+                   'a row per point with the positional arguments that it replaces. Results are written a row per '
+                   'point in the same format')
+    _add_flag(flags, '--input-format', metavar='str', choices=['csv', 'float64'],
+              help='format of --input: csv (values separated by commas or spaces) or float64 (little-endian rows). '
+                   'Defaults to float64 for .bin and .f64 files and csv otherwise')
+    _add_flag(flags, '--output', metavar='path-name',
+              help='file to write the results of --input to. Defaults to stdout')
     _add_flag(flags, '--precision', default=2, metavar='int', type=int,
               help='Number of decimal places to round printed output to, defaults to 2.')
+    nargs = _scan_nargs([flags[flag] for flag in flag_names], sys.argv[1:] if argv is None else argv)
     for flag in flag_names:
-        my_parser.add_argument(*flags[flag]['args'], **flags[flag]['kwargs'])
+        kwargs = dict(flags[flag]['kwargs'])
+        if 'narg_types' in kwargs:
+            kwargs.pop('narg_types')
+            kwargs['nargs'] = nargs[flags[flag]['args'][0]]
+        kwargs.setdefault('action', CustomAction)
+        my_parser.add_argument(*flags[flag]['args'], **kwargs)
     return my_parser
 
 
@@ -251,9 +362,102 @@ def _parse_args(flag_names, description):
     return commands
 
 
-def run_script(func, flag_names, output_format, name):
-    """Runs python function from wind_functions.py."""
+def _to_float64(data):
+    """Converts float32 arrays to float64 and leaves everything else alone."""
+    if isinstance(data, np.ndarray) and data.dtype == np.float32:
+        return data.astype(np.float64)
+    return data
+
+
+def _print_output(output_format, output, commands):
+    """Formats and prints the output of a function."""
+    # float32 is printed as float64 so that rounding gives the same digits for both.
+    if isinstance(output, tuple):
+        output = tuple(_to_float64(data) for data in output)
+    output = output_format(_to_float64(output), **commands)
+    if output is not None:
+        print(output)
+
+
+_AREA_ARGS = ['lat_ts', 'lat_0', 'long_0', 'projection', 'area_extent', 'shape', 'center', 'pixel_size',
+              'upper_left_extent', 'radius', 'units', 'projection_ellipsoid']
+
+
+def _shared_area(commands, areas):
+    """Finds the area of a file once per file shape and returns the arguments that make it."""
+    from pywinds.wind_functions import FloFile, _resolve_area
+
+    try:
+        file_shape = FloFile(commands['displacement_data']).file_shape
+    # Let the file report its own error.
+    except (OSError, ValueError):
+        return {}
+    if file_shape not in areas:
+        areas[file_shape] = _resolve_area(displacement_data=commands['displacement_data'],
+                                          **{key: commands.get(key) for key in _AREA_ARGS})
+    return areas[file_shape]
+
+
+def _run_batch(func, files, commands, output_format, jobs):
+    """Runs func on each file with a pool of jobs processes, reporting failures without stopping the batch."""
+    areas = {}
+    file_commands = []
+    for file in files:
+        file_commands.append(dict(commands, displacement_data=os.path.abspath(file)))
+        file_commands[-1].update(_shared_area(file_commands[-1], areas))
+    failures = 0
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        futures = [executor.submit(func, **kwargs) for kwargs in file_commands]
+        for kwargs, future in zip(file_commands, futures):
+            try:
+                _print_output(output_format, future.result(), kwargs)
+            except Exception as error:
+                failures += 1
+                logger.error('{0} failed: {1}: {2}'.format(kwargs['displacement_data'], type(error).__name__, error))
+    if failures:
+        logger.error('{0} of {1} files failed'.format(failures, len(files)))
+        sys.exit(1)
+
+
+def _write_profile(path, name, stats):
+    """Dumps the stages profiled while running name to a JSON file."""
+    with open(path, 'w') as file:
+        json.dump(dict(stats, function=name, argv=sys.argv[1:]), file, indent=2)
+    logger.info('Profile written to {0}'.format(path))
+
+
+def run_script(func, flag_names, output_format, name, point_names=None):
+    """Runs python function from wind_functions.py. point_names are the positional arguments that each row of --input
+    gives instead of the command line."""
+    if point_names and any(arg == '--input' or arg.startswith('--input=') for arg in sys.argv[1:]):
+        flag_names = [flag for flag in flag_names if flag not in point_names]
     commands = _parse_args(flag_names, func.__doc__.splitlines()[0])
+    profile_out = commands.pop('profile_out', None)
+    if profile_out is None:
+        _run_commands(func, commands, output_format, name, point_names)
+        return
+    from pywinds.wind_functions import profile
+
+    if commands.get('jobs') is not None:
+        logger.warning('--profile-out only profiles this process: files run with --jobs are left out')
+    stats = {}
+    try:
+        with profile() as stats:
+            _run_commands(func, commands, output_format, name, point_names)
+    finally:
+        _write_profile(profile_out, name, stats)
+
+
+def _run_commands(func, commands, output_format, name, point_names=None):
+    """Runs func with the parsed commands, on each file that displacement_data matches or each point of --input."""
+    input_path, input_format, output_path = [commands.pop(key, None) for key in ('input', 'input_format', 'output')]
+    if input_path is not None:
+        _run_points(func, commands, [name.replace('-', '_') for name in point_names], input_path, input_format,
+                    output_path)
+        return
+    if output_path is not None:
+        logger.warning('--output is only used with --input')
+    jobs = commands.pop('jobs', None)
     if name == 'wind_info':
         commands['timestamp'] = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
     displacement_data = commands.get('displacement_data')
@@ -265,18 +469,97 @@ def run_script(func, flag_names, output_format, name):
     if isinstance(displacement_data, str):
         files = glob(displacement_data)
         # If there are files, return after reading. Else let area fall through or error.
+        if files and jobs is not None:
+            _run_batch(func, files, commands, output_format, jobs)
+            return
         if files:
             for file in files:
                 commands['displacement_data'] = os.path.abspath(file)
-                output = output_format(func(**commands), **commands)
-                if output is not None:
-                    print(output)
+                _print_output(output_format, func(**commands), commands)
             return
         # File not found error will be raised from trying to find *.flo. Let area calculate as much as possible.
         elif name != 'area':
             func(**commands)
         commands.pop('displacement_data')
     # Only happens with lat_long, area, position_to_pixel, or if non string is given to displacement-data.
-    output = output_format(func(**commands), **commands)
-    if output is not None:
-        print(output)
+    _print_output(output_format, func(**commands), commands)
+
+
+# Rows of --input that are read and computed at a time.
+_POINT_CHUNK = 2 ** 16
+
+
+def _open_points(path, mode):
+    """Opens a file in binary mode, or stdin or stdout for '-' or None, which are left open afterwards."""
+    if path is None or path == '-':
+        # Taken right away, so that a worker gives scripts that stream through the client's stdin or stdout back to
+        # the client before any work is done.
+        return contextlib.nullcontext((sys.stdin if 'r' in mode else sys.stdout).buffer)
+    return open(path, mode)
+
+
+def _read_points(file, columns, input_format):
+    """Yields float64 arrays of up to _POINT_CHUNK rows of columns values each. csv rows hold values separated by
+    commas or spaces; blank lines and lines starting with # are skipped. float64 files are little-endian rows."""
+    if input_format == 'float64':
+        while True:
+            data = file.read(_POINT_CHUNK * columns * 8)
+            if not data:
+                return
+            if len(data) % (columns * 8):
+                raise ValueError('float64 input must be made of rows of {0} values, but ends in part of a row'.format(
+                    columns))
+            yield np.frombuffer(data, dtype='<f8').reshape(-1, columns)
+    line_number = 0
+    while True:
+        lines = list(itertools.islice(file, _POINT_CHUNK))
+        if not lines:
+            return
+        rows, line_numbers, error = [], [], None
+        for line_number, line in enumerate(lines, line_number + 1):
+            values = line.replace(b',', b' ').split()
+            if not values or values[0].startswith(b'#'):
+                continue
+            if len(values) != columns:
+                error = 'Line {0} of the input has {1} values instead of {2}'.format(line_number, len(values), columns)
+                break
+            rows.append(values)
+            line_numbers.append(line_number)
+        try:
+            points = np.array(rows, dtype=np.float64)
+        except ValueError:
+            # Only looked for row by row once the chunk is known to hold a bad value.
+            bad_row = next(row for row, values in enumerate(rows) if not _are_floats(values))
+            error = 'Line {0} of the input has a value that is not a number: {1}'.format(
+                line_numbers[bad_row], b' '.join(rows[bad_row]).decode('utf-8', 'replace'))
+            points = np.array(rows[:bad_row], dtype=np.float64)
+        # The rows before a bad one are still written.
+        if len(points):
+            yield points
+        if error is not None:
+            raise ValueError(error)
+
+
+def _are_floats(values):
+    try:
+        np.array(values, dtype=np.float64)
+    except ValueError:
+        return False
+    return True
+
+
+def _run_points(func, commands, columns, input_path, input_format, output_path):
+    """Streams the points of input_path through func, _POINT_CHUNK rows at a time, and writes a row of func's outputs
+    for each point to output_path (stdout by default): text rounded to precision for csv, and float64 for float64."""
+    from pywinds.wind_functions import _write_text
+
+    if input_format is None:
+        input_format = 'float64' if os.path.splitext(input_path)[1].lower() in ('.bin', '.f64') else 'csv'
+    with _open_points(input_path, 'rb') as source, _open_points(output_path, 'wb') as sink:
+        for points in _read_points(source, len(columns), input_format):
+            output = func(**dict(commands, **dict(zip(columns, points.T))))
+            output = np.column_stack([np.ravel(np.asarray(column, dtype=np.float64)) for column in output])
+            if input_format == 'float64':
+                sink.write(output.astype('<f8', copy=False).tobytes())
+            else:
+                _write_text(sink, output, commands['precision'])